@@ -12,13 +12,20 @@ DEFAULT_CONFIG = {
         "valid_count_threshold": 4,
         "block_resolution": 16,
         "block_count": 50000,
+        "auto_block_count": True, # Shrink block_count to fit the camera trajectory (saves memory)
         "frame_interval": 5,
         "camera": "left",
         "enable_drift_correction": True,
         "refinement_method": "gicp", # icp, gicp
         "loop_closure_detection": True,
         "enable_inpainting": False, # AI Depth Inpainting (Slows down)
-        "acceleration_backend": "auto", # auto, cuda, directml, cpu
+        "acceleration_backend": "auto", # auto, cuda, directml, tensorrt, cpu
+        "inpainting_fp16": True, # Half-precision MiDaS on CUDA
+        "inpainting_compile": False, # torch.compile MiDaS (needs PyTorch 2 + Triton, slow warm-up)
+        "inpainting_disk_cache": False, # Keep MiDaS depth in <project>/Cache/depth for re-runs (~4 bytes/pixel)
+        "color_mode": "rgb", # rgb, gray (luminance only, skips colour conversion)
+        "bilateral_depth": False, # Edge-preserving depth smoothing (Slows down)
+        "prefetch_frames": 3, # Frame sets decoded ahead of TSDF integration (bounds memory)
     },
     "ingestion": {
         "validation_checksum": True,
@@ -5,22 +5,19 @@ Handles user interaction, thread management, and UI rendering using Flet.
 
 import os
 import json
+import logging
 import threading
+import queue
 import time
 import shutil
+from collections import deque
+from functools import partial
 from pathlib import Path
 import numpy as np
 import flet as ft
 from datetime import datetime
 import webbrowser
 
-try:
-    import open3d as o3d
-    HAS_OPEN3D = True
-except ImportError:
-    HAS_OPEN3D = False
-    o3d = None
-
 # Lazy import cv2 to avoid file locking during NerfStudio installation
 # cv2 will be imported on-demand when actually needed
 cv2 = None
@@ -33,53 +30,69 @@ def _ensure_cv2():
         cv2 = cv2_module
     return cv2
 
+# Open3D is only needed by the visualizer (the pipeline imports it in the worker),
+# so loading the heavy extension is deferred until first use
+o3d = None
+
+def _ensure_open3d():
+    """Lazy-load open3d module when needed. Returns None if it is not installed."""
+    global o3d
+    if o3d is None:
+        try:
+            import open3d as o3d_module
+        except ImportError:
+            return None
+        o3d = o3d_module
+    return o3d
+
 import base64
 from .config_manager import ConfigManager
 from .ingestion import ZipValidator, AsyncExtractor
-from .reconstruction import QuestReconstructor
 from .image_processing import yuv_to_rgb, filter_depth
-from .quest_image_processor import QuestImageProcessor
+from .quest_image_processor import QuestImageProcessor, load_json
+
+logger = logging.getLogger("QuestGear3D.GUI")
 
 class ReconstructionThread(threading.Thread):
     """
     Worker thread that handles the 3D reconstruction process for Quest data.
     Uses QuestReconstructionPipeline to process YUV images and raw depth.
+    
+    All updates are posted to event_queue as (kind, payload) tuples, drained by the GUI:
+        ('status', str), ('log', str), ('progress', int percent),
+        ('frame', (index, rgb)), ('finished', result dict), ('error', str)
     """
-    def __init__(self, data_dir, config_manager, on_progress=None, on_status=None, on_log=None, on_finished=None, on_error=None, on_frame=None, start_frame=0, end_frame=None):
+    def __init__(self, data_dir, config_manager, event_queue, start_frame=0, end_frame=None):
         super().__init__()
         self.daemon = True # Ensure thread dies when app closes
         self.data_dir = data_dir
         self.config_manager = config_manager
-        self.on_progress = on_progress
-        self.on_status = on_status
-        self.on_log = on_log
-        self.on_finished = on_finished
-        self.on_error = on_error
-        self.on_frame = on_frame
+        self.event_queue = event_queue
         self.start_frame = start_frame
         self.end_frame = end_frame
         self._is_running = True
 
+    def _emit(self, kind, payload=None):
+        self.event_queue.put((kind, payload))
+
+    def _on_frame(self, index, rgb_data=None):
+        self._emit('frame', (index, rgb_data))
+
     def run(self):
         try:
             from .quest_reconstruction_pipeline import QuestReconstructionPipeline
             
-            if self.on_status:
-                self.on_status("Initializing Quest Reconstruction Pipeline...")
-            if self.on_log:
-                self.on_log("Initializing Quest Reconstruction Pipeline...")
+            self._emit('status', "Initializing Quest Reconstruction Pipeline...")
+            self._emit('log', "Initializing Quest Reconstruction Pipeline...")
             
             # Create pipeline
             pipeline = QuestReconstructionPipeline(self.data_dir, self.config_manager)
             
             # Run reconstruction
             result = pipeline.run_reconstruction(
-                on_progress=lambda p: (
-                    self.on_progress(p / 100.0) if self.on_progress else None,
-                    self.on_status(f"Processing: {p}%") if self.on_status else None
-                ),
-                on_log=self.on_log,
-                on_frame=self.on_frame,
+                on_progress=partial(self._emit, 'progress'),
+                on_log=partial(self._emit, 'log'),
+                on_frame=self._on_frame,
                 is_cancelled=lambda: not self._is_running, # Pass cancellation check
                 camera=self.config_manager.get("reconstruction.camera", "left"),
                 frame_interval=int(self.config_manager.get("reconstruction.frame_interval", 5)),
@@ -88,21 +101,16 @@ class ReconstructionThread(threading.Thread):
             )
             
             if result and result.get('mesh'):
-                if self.on_log:
-                    self.on_log(f"✓ Reconstruction complete!")
-                    if hasattr(result['mesh'], 'vertices'):
-                        self.on_log(f"  Vertices: {len(result['mesh'].vertices)}")
-                if self.on_finished:
-                    self.on_finished(result) # Pass full result dict
+                self._emit('log', f"✓ Reconstruction complete!")
+                if hasattr(result['mesh'], 'vertices'):
+                    self._emit('log', f"  Vertices: {len(result['mesh'].vertices)}")
+                self._emit('finished', result) # Pass full result dict
             else:
-                if self.on_error:
-                    self.on_error("Reconstruction failed - no mesh generated")
+                self._emit('error', "Reconstruction failed - no mesh generated")
         
         except Exception as e:
-            if self.on_error:
-                self.on_error(str(e))
-            if self.on_log:
-                self.on_log(f"ERROR: {str(e)}")
+            self._emit('error', str(e))
+            self._emit('log', f"ERROR: {str(e)}")
 
 
     def stop(self):
@@ -291,7 +299,8 @@ def main(page: ft.Page):
                 cv2 = _ensure_cv2()
                 # Convert to base64 for Flet
                 try:
-                    is_success, buffer = cv2.imencode(".jpg", cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR))
+                    bgr = rgb if rgb.ndim == 2 else cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+                    is_success, buffer = cv2.imencode(".jpg", bgr)
                     if is_success:
                         b64_img = base64.b64encode(buffer).decode("utf-8")
                         preview_img.src_base64 = b64_img
@@ -348,14 +357,83 @@ def main(page: ft.Page):
 
     frame_range_slider.on_change = on_range_change
     
+    # Log lines and UI refreshes are coalesced and flushed at most 10x per second
+    # (worker threads log/progress per frame; a page.update() per call starves the UI)
+    pending_logs = deque(maxlen=100)
+    log_lines = deque(maxlen=100)  # ring buffer backing log_list.controls
+    log_lock = threading.Lock()
+    ui_dirty = threading.Event()
+    recon_events = queue.Queue() # (kind, payload) from ReconstructionThread
+
+    def request_update():
+        ui_dirty.set()
+
     def add_log(msg):
         now = datetime.now().strftime("%H:%M:%S")
-        log_list.controls.append(ft.Text(f"[{now}] {msg}", font_family="Consolas", size=12, selectable=True))
-        if len(log_list.controls) > 100:
-            log_list.controls.pop(0)
-        try:
-            page.update()
-        except: pass
+        with log_lock:
+            pending_logs.append(f"[{now}] {msg}")
+        request_update()
+
+    def drain_recon_events(max_events=200):
+        """Apply queued reconstruction events; consecutive progress/status/frame events are merged."""
+        latest = {}
+        
+        def apply_latest():
+            if 'status' in latest:
+                status_text.value = latest.pop('status')
+                request_update()
+            if 'progress' in latest:
+                p = latest.pop('progress')
+                status_text.value = f"Processing: {p}%"
+                on_reconstruct_progress(p / 100.0)
+            if 'frame' in latest:
+                on_recon_frame(*latest.pop('frame'))
+        
+        handled = 0
+        while handled < max_events:
+            try:
+                kind, payload = recon_events.get_nowait()
+            except queue.Empty:
+                break
+            handled += 1
+            
+            if kind == 'log':
+                add_log(payload)
+            elif kind in ('status', 'progress', 'frame'):
+                latest[kind] = payload
+            else:
+                apply_latest()
+                if kind == 'finished':
+                    on_reconstruct_finished(payload)
+                elif kind == 'error':
+                    on_reconstruct_error(payload)
+        apply_latest()
+        return handled
+
+    def ui_flush_loop():
+        while True:
+            time.sleep(0.1)
+            try:
+                drain_recon_events()
+            except Exception:
+                logger.exception("UI event error")
+            if not ui_dirty.is_set():
+                continue
+            ui_dirty.clear()
+            
+            with log_lock:
+                lines = list(pending_logs)
+                pending_logs.clear()
+            
+            if lines:
+                for line in lines:
+                    log_lines.append(ft.Text(line, font_family="Consolas", size=12, selectable=True))
+                log_list.controls = list(log_lines)
+            try:
+                page.update()
+            except: pass
+
+    threading.Thread(target=ui_flush_loop, daemon=True).start()
 
     def show_msg(text):
         page.snack_bar = ft.SnackBar(content=ft.Text(text))
@@ -366,7 +444,7 @@ def main(page: ft.Page):
 
     def on_img_load_progress(val):
         progress_bar.value = val / 100.0
-        page.update()
+        request_update()
 
     def load_frames_ui_from_data(data):
         count = len(data)
@@ -406,10 +484,8 @@ def main(page: ft.Page):
             fj = os.path.join(d, "frames.json")
             if os.path.exists(fj):
                 try:
-                    with open(fj, 'r') as f:
-                        data = json.load(f)
-                        fs = data.get('frames', [])
-                        frames_data.extend(fs)
+                    data = load_json(fj)
+                    frames_data.extend(data.get('frames', []))
                 except: pass
         
         if frames_data:
@@ -577,12 +653,7 @@ def main(page: ft.Page):
         thread = ReconstructionThread(
             temp_dirs,
             config_manager,
-            on_progress=on_reconstruct_progress,
-            on_status=lambda msg: (setattr(status_text, "value", msg), page.update()),
-            on_log=add_log,
-            on_finished=on_reconstruct_finished,
-            on_error=on_reconstruct_error,
-            on_frame=on_recon_frame,
+            recon_events,
             start_frame=start_frame,
             end_frame=end_frame
         )
@@ -631,10 +702,11 @@ def main(page: ft.Page):
     thread = None
 
     def on_reconstruct_progress(val):
+        # Skip sub-0.5% changes, the bar cannot show them anyway
+        if progress_bar.value is not None and abs(val - progress_bar.value) < 0.005 and val < 1.0:
+            return
         progress_bar.value = val
-        try:
-            page.update()
-        except: pass
+        request_update()
 
     # viewer_3d already defined above
 
@@ -761,7 +833,8 @@ def main(page: ft.Page):
         btn_visualize.scale = 1.0
         btn_visualize.update()
         
-        if not HAS_OPEN3D:
+        o3d = _ensure_open3d()
+        if o3d is None:
             show_msg("Visualizer not available (Open3D missing).")
             return
             
@@ -833,6 +906,7 @@ def main(page: ft.Page):
             ft.dropdown.Option("auto", "Auto Detection"),
             ft.dropdown.Option("cuda", "NVIDIA CUDA"),
             ft.dropdown.Option("directml", "DirectML (AMD/Intel)"),
+            ft.dropdown.Option("tensorrt", "TensorRT (NVIDIA, ONNX Runtime)"),
             ft.dropdown.Option("cpu", "CPU Only (Safe)"),
         ],
         width=250
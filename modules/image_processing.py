@@ -1,41 +1,172 @@
-import cv2
+from functools import lru_cache
+
 import numpy as np
 
-def yuv_to_rgb(yuv_image):
+# Lazy load cv2; yuv_to_rgb falls back to NumPy when OpenCV is not installed
+cv2 = None
+
+def _ensure_cv2():
+    global cv2
+    if cv2 is None:
+        try:
+            import cv2 as cv2_module
+        except ImportError:
+            return None
+        cv2 = cv2_module
+    return cv2
+
+# YUV -> RGB exactly as OpenCV's COLOR_YUV2RGB computes it for 8-bit input (the conversion the
+# Quest path has always used): analog BT.601 YUV coefficients in 14-bit fixed point,
+# R = Y + 1.140 V', G = Y - 0.395 U' - 0.581 V', B = Y + 2.032 U' (U' = U - 128, V' = V - 128).
+_YUV_SHIFT = 14
+_YUV_ROUND = 1 << (_YUV_SHIFT - 1)
+_U2B = 33292   # round(2.032 * 2**14)
+_U2G = -6472   # round(-0.395 * 2**14)
+_V2G = -9519   # round(-0.581 * 2**14)
+_V2R = 18678   # round(1.140 * 2**14)
+
+# Chroma is upsampled 2x with bilinear weights (0.75 / 0.25, edge-clamped) in the same fixed-point
+# order as cv2.resize(INTER_LINEAR), so every path reproduces the OpenCV result bit for bit:
+# h = 3 * near + far along a row, then ((3 * h_near >> 2) + (h_far >> 2) + 2) >> 2 down a column.
+
+def _upsample_chroma(plane):
+    """NumPy version of cv2.resize(plane, 2x, INTER_LINEAR) for uint8 chroma (int32 result)."""
+    c = plane.astype(np.int32)
+    padded = np.pad(c, ((0, 0), (1, 1)), mode="edge")
+    rows = np.empty((c.shape[0], c.shape[1] * 2), dtype=np.int32)
+    rows[:, 0::2] = 3 * c + padded[:, :-2]
+    rows[:, 1::2] = 3 * c + padded[:, 2:]
+    
+    near = (3 * rows) >> 2
+    far = np.pad(rows >> 2, ((1, 1), (0, 0)), mode="edge")
+    up = np.empty((rows.shape[0] * 2, rows.shape[1]), dtype=np.int32)
+    up[0::2] = (near + far[:-2] + 2) >> 2
+    up[1::2] = (near + far[2:] + 2) >> 2
+    return up
+
+def _split_yuv420(yuv_image, width, height, layout):
+    """Slice Y, U, V plane views (no copies) out of a YUV 4:2:0 buffer."""
+    if width is None or height is None:
+        height = yuv_image.shape[0] * 2 // 3
+        width = yuv_image.shape[1]
+
+    buf = np.asarray(yuv_image, dtype=np.uint8).reshape(-1)
+    y_size = width * height
+    c_h, c_w = height // 2, width // 2
+    c_size = c_h * c_w
+
+    y_plane = buf[:y_size].reshape(height, width)
+    if layout == "nv12":
+        uv = buf[y_size:y_size + 2 * c_size].reshape(c_h, c_w, 2)
+        u_plane, v_plane = uv[..., 0], uv[..., 1]
+    else:
+        u_plane = buf[y_size:y_size + c_size].reshape(c_h, c_w)
+        v_plane = buf[y_size + c_size:y_size + 2 * c_size].reshape(c_h, c_w)
+    return y_plane, u_plane, v_plane, width, height
+
+def yuv_to_rgb(yuv_image, width=None, height=None, layout="i420", out=None, mode="rgb"):
     """
-    Convert YUV420 image to RGB.
-    Assumes standard NV12 or similar format if coming from Android Camera2 API via Quest.
+    Convert a YUV 4:2:0 buffer to RGB (uint8, HxWx3).
+    Accepts either a flat uint8 buffer or the (H*3/2, W) image OpenCV expects.
+    layout: "i420" (planar Y, U, V - Quest YUV_420_888 dumps) or "nv12" (Y + interleaved UV).
+    out: optional preallocated (H, W, 3) uint8 destination, filled in place and returned.
+    mode: "rgb", or "gray" to return only the luma plane (H, W) with no colour conversion.
+    Chroma is upsampled bilinearly and converted like cv2.COLOR_YUV2RGB. Uses OpenCV when
+    available, otherwise a bit-identical vectorized NumPy path.
     """
     if yuv_image is None:
         return None
-    # Depending on exact format (NV12 vs NV21), this might need adjustment.
-    # Standard OpenCV conversion:
-    rgb_image = cv2.cvtColor(yuv_image, cv2.COLOR_YUV2RGB_NV12)
-    return rgb_image
 
-def apply_intrinsics(image, intrinsics, distortion_coeffs):
+    y_plane, u_plane, v_plane, width, height = _split_yuv420(yuv_image, width, height, layout)
+
+    if mode == "gray":
+        return np.ascontiguousarray(y_plane)
+
+    cv2 = _ensure_cv2()
+    if cv2 is not None:
+        size = (width, height)
+        yuv = cv2.merge([
+            np.ascontiguousarray(y_plane),
+            cv2.resize(np.ascontiguousarray(u_plane), size, interpolation=cv2.INTER_LINEAR),
+            cv2.resize(np.ascontiguousarray(v_plane), size, interpolation=cv2.INTER_LINEAR),
+        ])
+        return cv2.cvtColor(yuv, cv2.COLOR_YUV2RGB, dst=out)
+
+    y = y_plane.astype(np.int32)
+    u = _upsample_chroma(u_plane) - 128
+    v = _upsample_chroma(v_plane) - 128
+    rgb = np.empty((height, width, 3), dtype=np.int32)
+    rgb[..., 0] = (_V2R * v + _YUV_ROUND) >> _YUV_SHIFT
+    rgb[..., 1] = (_U2G * u + _V2G * v + _YUV_ROUND) >> _YUV_SHIFT
+    rgb[..., 2] = (_U2B * u + _YUV_ROUND) >> _YUV_SHIFT
+    rgb += y[..., None]
+    np.clip(rgb, 0, 255, out=rgb)
+
+    if out is None:
+        return rgb.astype(np.uint8)
+    np.copyto(out, rgb, casting="unsafe")
+    return out
+
+@lru_cache(maxsize=4)
+def _build_undistort_maps(size, k_key, d_key):
+    """Rectify maps for one (size, intrinsics, distortion) combination - built once per capture."""
+    cv2 = _ensure_cv2()
+    intrinsics = np.array(k_key, dtype=np.float64).reshape(3, 3)
+    distortion_coeffs = np.array(d_key, dtype=np.float64)
+    new_camera_matrix, roi = cv2.getOptimalNewCameraMatrix(intrinsics, distortion_coeffs, size, 1, size)
+    return cv2.initUndistortRectifyMap(
+        intrinsics, distortion_coeffs, None, new_camera_matrix, size, cv2.CV_16SC2
+    )
+
+def apply_intrinsics(image, intrinsics, distortion_coeffs, out=None):
     """
     Undistort image using camera intrinsics.
     intrinsics: 3x3 cameramatrix
     distortion_coeffs: 1x5 or 1x8 vector
+    out: optional preallocated destination, filled in place and returned.
+    The remap tables are cached, so repeated calls with the same calibration only pay for cv2.remap.
     """
+    cv2 = _ensure_cv2()
     h, w = image.shape[:2]
-    new_camera_matrix, roi = cv2.getOptimalNewCameraMatrix(intrinsics, distortion_coeffs, (w, h), 1, (w, h))
-    undistorted_img = cv2.undistort(image, intrinsics, distortion_coeffs, None, new_camera_matrix)
-    return undistorted_img
+    map1, map2 = _build_undistort_maps(
+        (w, h),
+        tuple(np.asarray(intrinsics, dtype=np.float64).ravel()),
+        tuple(np.asarray(distortion_coeffs, dtype=np.float64).ravel()),
+    )
+    return cv2.remap(image, map1, map2, cv2.INTER_LINEAR, dst=out, borderMode=cv2.BORDER_CONSTANT)
 
-def filter_depth(depth_map, check_val=0.0):
+def filter_depth(depth_map, check_val=0.0, max_depth=None, smooth=False, bilateral=False, copy=True):
     """
     Apply filtering to depth map to remove noise.
-    Using simple bilateral filter for now.
+    Samples that are non-finite, <= check_val or > max_depth are zeroed (vectorized mask).
+    uint16 (millimeter) depth keeps its dtype, so check_val/max_depth are in its units.
+    smooth: 3x3 median blur (SIMD in OpenCV).
+    bilateral: edge-preserving bilateral filter (d=5) - much slower, opt-in only.
+    Float input, and any input filtered with bilateral=True, is returned as float32.
+    copy: False masks a float32/uint16 input in place instead of copying it first.
     """
     if depth_map is None:
         return None
         
-    # Convert to float32 for processing if needed
-    depth_float = depth_map.astype(np.float32)
+    # By default work on a copy so the caller's array is left untouched
+    as_array = np.array if copy else np.asarray
+    if depth_map.dtype == np.uint16:
+        depth_float = as_array(depth_map)
+        invalid = depth_float <= check_val
+    else:
+        depth_float = as_array(depth_map, dtype=np.float32)
+        invalid = ~np.isfinite(depth_float)
+        invalid |= depth_float <= check_val
+    if max_depth is not None:
+        invalid |= depth_float > max_depth
+    depth_float[invalid] = 0.0
     
-    # Bilateral filter needs 8-bit or 32-bit float
-    filtered_depth = cv2.bilateralFilter(depth_float, 5, 50, 50)
+    if smooth or bilateral:
+        cv2 = _ensure_cv2()
+        if smooth:
+            depth_float = cv2.medianBlur(depth_float, 3)
+        if bilateral:
+            # Bilateral filter needs 8-bit or 32-bit float
+            depth_float = cv2.bilateralFilter(depth_float.astype(np.float32, copy=False), 5, 50, 50)
     
-    return filtered_depth
+    return depth_float
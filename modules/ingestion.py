@@ -8,6 +8,7 @@ import os
 import shutil
 import tempfile
 import json
+import struct
 
 
 class ZipValidator:
@@ -16,8 +17,12 @@ class ZipValidator:
     REQUIRED_DIRS = ["raw_images", "depth_maps"]
 
     @staticmethod
-    def validate(zip_path, log_callback=None):
-        """Validate ZIP file structure with optional logging."""
+    def validate(zip_path, log_callback=None, deep=False):
+        """
+        Validate ZIP file structure with optional logging.
+        Only the central directory is read; deep=True additionally decompresses
+        every member to verify CRCs (slow on multi-GB captures).
+        """
         def log(msg):
             if log_callback:
                 log_callback(msg)
@@ -37,8 +42,20 @@ class ZipValidator:
                 for i, f in enumerate(file_list[:10]):
                     log(f"  - {f}")
                 
-                # Look for frames.json anywhere in the structure (not just root)
-                frames_json_found = any('frames.json' in f for f in file_list)
+                # Single pass over the names: look for frames.json anywhere in the
+                # structure (not just root), images and depth maps; stop once all are seen
+                frames_json_found = has_images = has_depth = False
+                for f in file_list:
+                    lower = f.lower()
+                    if not frames_json_found and 'frames.json' in f:
+                        frames_json_found = True
+                    if not has_images and ('rgb' in lower or 'image' in lower or '.png' in lower or '.jpg' in lower):
+                        has_images = True
+                    if not has_depth and 'depth' in lower:
+                        has_depth = True
+                    if frames_json_found and has_images and has_depth:
+                        break
+                
                 if not frames_json_found:
                     log("WARNING: frames.json not found anywhere in ZIP")
                     log("Checking for alternative metadata files...")
@@ -52,10 +69,6 @@ class ZipValidator:
                 else:
                     log(f"✓ Found frames.json")
                 
-                # Check directories (look for image and depth files)
-                has_images = any('rgb' in f.lower() or 'image' in f.lower() or '.png' in f.lower() or '.jpg' in f.lower() for f in file_list)
-                has_depth = any('depth' in f.lower() for f in file_list)
-                
                 if has_images:
                     log(f"✓ Found image files")
                 else:
@@ -68,6 +81,12 @@ class ZipValidator:
                 
                 # If we have at least images, proceed
                 if has_images or len(file_list) > 100:
+                    if deep:
+                        log("Verifying member CRCs...")
+                        bad_member = zf.testzip()
+                        if bad_member is not None:
+                            log(f"ERROR: Corrupt ZIP member: {bad_member}")
+                            return False, f"Corrupt ZIP member: {bad_member}"
                     log("✓ Validation passed (flexible mode)")
                     return True, "Validation successful (flexible mode)"
                 else:
@@ -77,8 +96,13 @@ class ZipValidator:
             return False, f"Validation error: {str(e)}"
 
 import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 class AsyncExtractor(threading.Thread):
+    COPY_BUFFER_SIZE = 1 << 20  # 1 MB chunks keep syscalls low for large YUV/depth files
+    # Stored (uncompressed) members can be copied by the kernel without passing through Python
+    USE_SENDFILE = hasattr(os, 'sendfile') and hasattr(os, 'pread')
+
     def __init__(self, zip_path, on_progress=None, on_finished=None, on_error=None, on_log=None):
         super().__init__()
         self.zip_path = zip_path
@@ -88,11 +112,76 @@ class AsyncExtractor(threading.Thread):
         self.on_error = on_error
         self.on_log = on_log
         self._is_running = True
+        self._created_dirs = set()
+        self._tls = threading.local()
+        self._worker_zips = []
+        self._worker_zips_lock = threading.Lock()
 
     def stop(self):
         """Signal the extractor to stop."""
         self._is_running = False
 
+    @staticmethod
+    def _member_path(dest_dir, name):
+        """Target path for a ZIP member, sanitized the same way ZipFile.extract does."""
+        parts = os.path.splitdrive(name.replace('\\', '/'))[1].split('/')
+        parts = [p for p in parts if p not in ('', '.', '..')]
+        return os.path.join(dest_dir, *parts)
+
+    def _makedirs(self, path):
+        # Most members share a handful of folders; skip the stat calls for known ones
+        if path not in self._created_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._created_dirs.add(path)
+
+    def _worker_zip(self):
+        """Per-thread ZipFile handle, so workers do not serialize on one shared file object."""
+        zf = getattr(self._tls, 'zf', None)
+        if zf is None:
+            zf = self._tls.zf = zipfile.ZipFile(self.zip_path, 'r')
+            with self._worker_zips_lock:
+                self._worker_zips.append(zf)
+        return zf
+
+    def _close_worker_zips(self):
+        with self._worker_zips_lock:
+            for zf in self._worker_zips:
+                zf.close()
+            self._worker_zips.clear()
+
+    @staticmethod
+    def _sendfile_member(src_fd, info, dst):
+        """Copy a ZIP_STORED member straight from the archive fd to dst (zero-copy)."""
+        header = os.pread(src_fd, 30, info.header_offset)
+        if len(header) != 30 or header[:4] != b'PK\x03\x04':
+            raise zipfile.BadZipFile(f"Bad local file header for {info.filename}")
+        name_len, extra_len = struct.unpack('<HH', header[26:30])
+        offset = info.header_offset + 30 + name_len + extra_len
+        remaining = info.file_size
+        while remaining > 0:
+            sent = os.sendfile(dst.fileno(), src_fd, offset, remaining)
+            if sent == 0:
+                raise zipfile.BadZipFile(f"Truncated data for {info.filename}")
+            offset += sent
+            remaining -= sent
+
+    def _extract_member(self, info, src_fd=None):
+        if not self._is_running:
+            return
+        target = self._member_path(self.temp_dir, info.filename)
+        if info.is_dir():
+            self._makedirs(target)
+            return
+        self._makedirs(os.path.dirname(target))
+        
+        stored = info.compress_type == zipfile.ZIP_STORED and not info.flag_bits & 0x1
+        if src_fd is not None and stored:
+            with open(target, 'wb', buffering=0) as dst:
+                self._sendfile_member(src_fd, info, dst)
+            return
+        with self._worker_zip().open(info) as src, open(target, 'wb', buffering=self.COPY_BUFFER_SIZE) as dst:
+            shutil.copyfileobj(src, dst, length=self.COPY_BUFFER_SIZE)
+
     def run(self):
         try:
             # Create extraction directory next to the ZIP file
@@ -109,31 +198,50 @@ class AsyncExtractor(threading.Thread):
             os.makedirs(self.temp_dir, exist_ok=True)
             
             with zipfile.ZipFile(self.zip_path, 'r') as zf:
-                file_list = zf.namelist()
-                total_files = len(file_list)
+                entries = zf.infolist()
+                total_files = len(entries)
                 if self.on_log: self.on_log(f"Found {total_files} items. Starting extraction to {self.temp_dir}...")
                 
                 # Log throttling to avoid flooding UI thread
                 log_every = max(1, total_files // 20) 
+                last_progress = -1
                 
-                for i, file in enumerate(file_list):
-                    # Check if we should stop
-                    if not self._is_running:
-                        if self.on_log: self.on_log("Extraction STOPPED by user.")
-                        # Clean up partial extraction
-                        if self.temp_dir and os.path.exists(self.temp_dir):
-                            zf.close() # Close ZIP before deleting folder
-                            shutil.rmtree(self.temp_dir)
+                # Entries are extracted in parallel (zlib inflate releases the GIL); progress
+                # is merged here in completion order so it stays monotonic
+                pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+                src_fd = os.open(self.zip_path, os.O_RDONLY) if self.USE_SENDFILE else None
+                try:
+                    futures = {pool.submit(self._extract_member, info, src_fd): info.filename for info in entries}
+                    for i, future in enumerate(as_completed(futures)):
+                        future.result()
                         
-                        if self.on_error:
-                            self.on_error("Stopped")
-                        return # Exit thread
-
-                    if i % log_every == 0:
-                        if self.on_log: self.on_log(f"[{i+1}/{total_files}] Extracting: {file}")
+                        # Check if we should stop
+                        if not self._is_running:
+                            break
+                        
+                        if i % log_every == 0:
+                            if self.on_log: self.on_log(f"[{i+1}/{total_files}] Extracted: {futures[future]}")
+                        
+                        progress = int((i + 1) / total_files * 100)
+                        if progress != last_progress:
+                            last_progress = progress
+                            if self.on_progress: self.on_progress(progress)
+                finally:
+                    pool.shutdown(wait=True, cancel_futures=True)
+                    self._close_worker_zips()
+                    if src_fd is not None:
+                        os.close(src_fd)
+                
+                if not self._is_running:
+                    if self.on_log: self.on_log("Extraction STOPPED by user.")
+                    # Clean up partial extraction
+                    if self.temp_dir and os.path.exists(self.temp_dir):
+                        zf.close() # Close ZIP before deleting folder
+                        shutil.rmtree(self.temp_dir)
                     
-                    zf.extract(file, self.temp_dir)
-                    if self.on_progress: self.on_progress(int((i + 1) / total_files * 100))
+                    if self.on_error:
+                        self.on_error("Stopped")
+                    return # Exit thread
             
             if self.on_log: self.on_log(f"SUCCESS: Extracted {total_files} files.")
             if self.on_finished: self.on_finished(self.temp_dir)
@@ -4,11 +4,10 @@ import cv2
 import numpy as np
 import os
 import ssl
-
-# Fix for SSL: CERTIFICATE_VERIFY_FAILED
-ssl._create_default_https_context = ssl._create_unverified_context
-# Fix for SSL: CERTIFICATE_VERIFY_FAILED
-ssl._create_default_https_context = ssl._create_unverified_context
+import io
+import hashlib
+import threading
+from collections import OrderedDict
 
 try:
     import onnxruntime as ort
@@ -16,14 +15,82 @@ try:
 except ImportError:
     HAS_ONNX = False
 
+try:
+    import intel_extension_for_pytorch as ipex
+    HAS_IPEX = True
+except ImportError:
+    HAS_IPEX = False
+
+try:
+    import xxhash
+    HAS_XXHASH = True
+except ImportError:
+    HAS_XXHASH = False
+
+try:
+    import lz4.frame
+    HAS_LZ4 = True
+except ImportError:
+    HAS_LZ4 = False
+
+def _hub_load(repo, model):
+    """
+    torch.hub.load with certificate verification relaxed for the duration of the load only.
+    Fix for SSL: CERTIFICATE_VERIFY_FAILED on some Windows setups, without patching
+    the default HTTPS context for the rest of the process.
+    Once the repo is in the hub cache it is loaded from there (source="local"), which skips
+    the GitHub round-trip torch.hub makes for every load of a "owner/name" repo.
+    """
+    owner, _, name = repo.partition("/")
+    local_dir = os.path.join(torch.hub.get_dir(), f"{owner}_{name}_master")
+    
+    # Also needed for local loads: hubconf downloads checkpoints that are not cached yet
+    default_context = ssl._create_default_https_context
+    ssl._create_default_https_context = ssl._create_unverified_context
+    try:
+        if os.path.isfile(os.path.join(local_dir, "hubconf.py")):
+            return torch.hub.load(local_dir, model, source="local")
+        return torch.hub.load(repo, model)
+    finally:
+        ssl._create_default_https_context = default_context
+
+# MiDaS transforms namespace, shared by every model type; loaded on first use
+_MIDAS_TRANSFORMS = None
+
+def _midas_transforms():
+    global _MIDAS_TRANSFORMS
+    if _MIDAS_TRANSFORMS is None:
+        _MIDAS_TRANSFORMS = _hub_load("intel-isl/MiDaS", "transforms")
+    return _MIDAS_TRANSFORMS
+
+# Loaded Torch models shared by all DepthEstimator instances in this process, keyed by
+# (model_type, device, fp16, compile); torch.hub.load re-reads the checkpoint on every call
+_TORCH_MODEL_CACHE = {}
+_TORCH_MODEL_CACHE_LOCK = threading.Lock()
+
 class DepthEstimator:
-    def __init__(self, model_type="MiDaS_small", use_gpu=True, backend="auto"):
+    def __init__(self, model_type="MiDaS_small", use_gpu=True, backend="auto", fp16=True, compile_model=False,
+                 cache_size=0, cache_dir=None):
         """
         Initialize MiDaS depth estimator.
-        backend: "auto", "cuda", "directml", "cpu"
+        backend: "auto", "cuda", "directml", "tensorrt" (ONNX Runtime TensorRT EP), "cpu"
+        fp16: run the Torch model in half precision (CUDA backend only)
+        compile_model: wrap the Torch model with torch.compile (slow first call, faster after)
+        cache_size: depth maps kept in memory for repeated estimate_depth calls (0 disables;
+                    only worth enabling when the same frames are estimated more than once)
+        cache_dir: optional folder for an on-disk .npy cache that survives restarts
         """
         self.model_type = model_type
         self.backend = backend
+        self.fp16 = fp16
+        self.compile_model = compile_model
+        self.cache_size = cache_size
+        self.cache_dir = cache_dir
+        self._mem_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Scratch buffers for save_depth_map, reused while the frame size stays the same
+        self._f32_buf = None
+        self._u16_buf = None
         
         # Decide device and provider
         self.ort_session = None
@@ -37,25 +104,86 @@ class DepthEstimator:
             else:
                 self.backend = "cpu"
                 
+        if self.backend == "tensorrt" and not (HAS_ONNX and 'TensorrtExecutionProvider' in ort.get_available_providers()):
+            print("[DepthEstimator] ONNX Runtime TensorRT provider not available, using Torch instead.")
+            self.backend = "cuda" if torch.cuda.is_available() else "cpu"
+                
         print(f"[DepthEstimator] Initializing with backend: {self.backend}")
         
-        if self.backend == "directml" or self.backend == "onnx_cpu":
+        if self.backend in ("directml", "onnx_cpu", "tensorrt"):
             self._init_onnx()
         else:
             self._init_torch()
 
     def _init_torch(self):
         self.torch_device = torch.device("cuda" if self.backend == "cuda" else "cpu")
+        cache_key = (self.model_type, str(self.torch_device), bool(self.fp16), bool(self.compile_model))
+        with _TORCH_MODEL_CACHE_LOCK:
+            cached = _TORCH_MODEL_CACHE.get(cache_key)
+            if cached is not None:
+                print(f"[DepthEstimator] Reusing loaded {self.model_type} ({self.torch_device})")
+                self.model, self.transform, self.input_dtype, self.memory_format = cached
+                return
+            self._load_torch()
+            _TORCH_MODEL_CACHE[cache_key] = (self.model, self.transform, self.input_dtype, self.memory_format)
+
+    def _load_torch(self):
         print(f"[DepthEstimator] Loading {self.model_type} on Torch ({self.torch_device})...")
-        self.model = torch.hub.load("intel-isl/MiDaS", self.model_type)
+        self.model = _hub_load("intel-isl/MiDaS", self.model_type)
         self.model.to(self.torch_device)
         self.model.eval()
         
-        midas_transforms = torch.hub.load("intel-isl/MiDaS", "transforms")
+        # Half precision halves weight/activation traffic and uses tensor cores for the convs
+        self.input_dtype = torch.float32
+        self.memory_format = torch.contiguous_format
+        if self.fp16 and self.torch_device.type == "cuda":
+            self.model.half()
+            self.input_dtype = torch.float16
+        if self.torch_device.type == "cuda":
+            # NHWC lets cuDNN pick Tensor Core conv kernels without internal layout transposes
+            self.model = self.model.to(memory_format=torch.channels_last)
+            self.memory_format = torch.channels_last
+        elif self.torch_device.type == "cpu" and HAS_IPEX:
+            # oneDNN conv/bn folding and blocked layouts for Intel CPUs
+            self.model = ipex.optimize(self.model)
+            print("[DepthEstimator] Intel Extension for PyTorch optimizations enabled.")
+        
+        midas_transforms = _midas_transforms()
         if self.model_type in ["DPT_Large", "DPT_Hybrid"]:
             self.transform = midas_transforms.dpt_transform
         else:
             self.transform = midas_transforms.small_transform
+        
+        if self.compile_model:
+            self._compile_torch()
+
+    def _compile_torch(self):
+        """
+        Fuse the MiDaS forward with Inductor; stays in eager mode if compilation is unavailable.
+        Note: raises the process-global torch._dynamo.config.cache_size_limit to at least 64.
+        It is left raised because Dynamo consults it on every later recompile of this model,
+        not just during the warm-up here.
+        """
+        if not hasattr(torch, "compile"):
+            print("[DepthEstimator] torch.compile requires PyTorch 2.x, using eager mode.")
+            return
+        
+        eager_model = self.model
+        try:
+            # Frames keep their aspect ratio, so input sizes vary: compile for dynamic shapes
+            torch._dynamo.config.cache_size_limit = max(torch._dynamo.config.cache_size_limit, 64)
+            self.model = torch.compile(eager_model, mode="max-autotune-no-cudagraphs", dynamic=True)
+            
+            # Warm up once here so the compile cost is not paid on the first frame
+            size = 256 if "small" in self.model_type else 384
+            dummy = torch.zeros(1, 3, size, size, device=self.torch_device, dtype=self.input_dtype)
+            dummy = dummy.contiguous(memory_format=self.memory_format)
+            with torch.inference_mode():
+                self.model(dummy)
+            print("[DepthEstimator] torch.compile enabled.")
+        except Exception as e:
+            print(f"[DepthEstimator] torch.compile failed ({e}), using eager mode.")
+            self.model = eager_model
 
     def _init_onnx(self):
         # We need an ONNX file. If not exists, export it once using torch
@@ -65,7 +193,18 @@ class DepthEstimator:
             print(f"[DepthEstimator] Exporting {self.model_type} to ONNX (one-time setup)...")
             self._export_to_onnx(onnx_path)
             
-        providers = ['DmlExecutionProvider', 'CPUExecutionProvider'] if self.backend == "directml" else ['CPUExecutionProvider']
+        if self.backend == "directml":
+            providers = ['DmlExecutionProvider', 'CPUExecutionProvider']
+        elif self.backend == "tensorrt":
+            # FP16 TensorRT engine; building it takes minutes, so it is cached next to the ONNX file
+            trt_options = {
+                'trt_fp16_enable': self.fp16,
+                'trt_engine_cache_enable': True,
+                'trt_engine_cache_path': os.path.join(os.path.dirname(onnx_path), "trt_cache"),
+            }
+            providers = [('TensorrtExecutionProvider', trt_options), 'CUDAExecutionProvider', 'CPUExecutionProvider']
+        else:
+            providers = ['CPUExecutionProvider']
         self.ort_session = ort.InferenceSession(onnx_path, providers=providers)
         print(f"[DepthEstimator] ONNX Session initialized with providers: {self.ort_session.get_providers()}")
         
@@ -73,24 +212,98 @@ class DepthEstimator:
         self.input_size = (256, 256) if "small" in self.model_type else (384, 384)
 
     def _export_to_onnx(self, path):
-        model = torch.hub.load("intel-isl/MiDaS", self.model_type)
+        model = _hub_load("intel-isl/MiDaS", self.model_type)
         model.eval()
         dummy_input = torch.randn(1, 3, 256, 256) if "small" in self.model_type else torch.randn(1, 3, 384, 384)
         torch.onnx.export(model, dummy_input, path, opset_version=11, 
                           input_names=['input'], output_names=['output'],
                           dynamic_axes={'input': {2: 'height', 3: 'width'}, 'output': {2: 'height', 3: 'width'}})
 
-    def estimate_depth(self, image_path_or_array):
+    @staticmethod
+    def _load_rgb(image_path_or_array):
         if isinstance(image_path_or_array, str):
             img = cv2.imread(image_path_or_array)
-            img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+            # BGR -> RGB as a reversed-stride view; the MiDaS transform and cv2.resize
+            # both produce new arrays anyway, so no extra HxWx3 copy is needed here
+            return img[..., ::-1]
+        if image_path_or_array.ndim == 2:
+            # Luminance-only frames (reconstruction color_mode 'gray')
+            return cv2.cvtColor(image_path_or_array, cv2.COLOR_GRAY2RGB)
+        return image_path_or_array
+
+    def _cache_key(self, image_path_or_array):
+        if isinstance(image_path_or_array, str):
+            stat = os.stat(image_path_or_array)
+            data = f"{os.path.abspath(image_path_or_array)}|{stat.st_mtime_ns}|{stat.st_size}".encode()
         else:
-            img = image_path_or_array
+            arr = np.ascontiguousarray(image_path_or_array)
+            data = memoryview(arr).cast('B')
+        hasher = xxhash.xxh3_64() if HAS_XXHASH else hashlib.blake2b(digest_size=8)
+        # Backend and precision change the output, so fp16 CUDA/TensorRT maps must not
+        # be served to fp32 or ONNX runs sharing the same cache_dir
+        hasher.update(f"{self.model_type}|{self.backend}|{bool(self.fp16)}|"
+                      f"{getattr(image_path_or_array, 'shape', '')}|"
+                      f"{getattr(image_path_or_array, 'dtype', '')}|".encode())
+        hasher.update(data)
+        return hasher.hexdigest()
+
+    def _cache_get(self, key):
+        with self._cache_lock:
+            depth = self._mem_cache.get(key)
+            if depth is not None:
+                self._mem_cache.move_to_end(key)
+                return depth
+        if self.cache_dir:
+            path = os.path.join(self.cache_dir, f"{key}.npy")
+            if os.path.exists(path):
+                try:
+                    depth = np.load(path)
+                except (OSError, ValueError):
+                    return None
+                self._cache_put(key, depth, write_disk=False)
+                return depth
+        return None
+
+    def _cache_put(self, key, depth, write_disk=True):
+        # Cached maps are shared between callers, so hand them out read-only
+        depth.setflags(write=False)
+        if self.cache_size > 0:
+            with self._cache_lock:
+                self._mem_cache[key] = depth
+                self._mem_cache.move_to_end(key)
+                while len(self._mem_cache) > self.cache_size:
+                    self._mem_cache.popitem(last=False)
+        if write_disk and self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = os.path.join(self.cache_dir, f"{key}.npy")
+            # Write then rename so a concurrent reader never sees a partial file
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.save(f, depth)
+            os.replace(tmp_path, path)
+
+    def estimate_depth(self, image_path_or_array):
+        """
+        Normalized (0..1) MiDaS depth for an image path or RGB/gray array.
+        Results are cached (see cache_size / cache_dir) and returned read-only.
+        """
+        use_cache = self.cache_size > 0 or self.cache_dir
+        if use_cache:
+            key = self._cache_key(image_path_or_array)
+            depth = self._cache_get(key)
+            if depth is not None:
+                return depth
+        
+        img = self._load_rgb(image_path_or_array)
 
         if self.ort_session:
-            return self._estimate_onnx(img)
+            depth = self._estimate_onnx(img)
         else:
-            return self._estimate_torch(img)
+            depth = self._estimate_torch(img)
+        
+        if use_cache:
+            self._cache_put(key, depth)
+        return depth
 
     def _estimate_onnx(self, img):
         # Preprocess
@@ -114,13 +327,124 @@ class DepthEstimator:
         return self._normalize(prediction)
 
     def _estimate_torch(self, img):
-        input_batch = self.transform(img).to(self.torch_device)
-        with torch.no_grad():
-            prediction = self.model(input_batch)
-            prediction = torch.nn.functional.interpolate(
-                prediction.unsqueeze(1), size=img.shape[:2], mode="bicubic", align_corners=False
-            ).squeeze()
-        return self._normalize(prediction.cpu().numpy())
+        input_batch = self.transform(img).to(self.torch_device, dtype=self.input_dtype)
+        input_batch = input_batch.contiguous(memory_format=self.memory_format)
+        with torch.inference_mode():
+            prediction = self.model(input_batch).float()
+            return self._upsample_normalize(prediction, img.shape[:2])[0]
+
+    def _upsample_normalize(self, prediction, size):
+        """
+        Bicubic-resize (N, h, w) predictions to size (H, W) and normalize each map.
+        Returns an (N, H, W) float32 array. On CPU, OpenCV's SIMD bicubic resize is used
+        instead of the much slower F.interpolate CPU kernel.
+        """
+        if self.torch_device.type == "cpu":
+            h, w = size
+            return np.stack([
+                self._normalize(cv2.resize(p, (w, h), interpolation=cv2.INTER_CUBIC))
+                for p in prediction.numpy()
+            ])
+        depth = torch.nn.functional.interpolate(
+            prediction.unsqueeze(1), size=size, mode="bicubic", align_corners=False
+        ).squeeze(1)
+        return self._normalize_torch(depth).cpu().numpy()
+
+    def estimate_depth_batch(self, images, batch_size=8):
+        """
+        Estimate depth for a sequence of image paths/arrays.
+        Yields one normalized depth map per image, in input order.
+        On the Torch backend images go through MiDaS batch_size at a time.
+        """
+        if self.ort_session:
+            # The exported ONNX graph has a fixed batch dimension of 1
+            for image in images:
+                yield self.estimate_depth(image)
+            return
+
+        # Batch N+1 is transformed and uploaded while batch N's forward is still
+        # running on the GPU; results of batch N are only collected afterwards
+        pending = None
+        for batch in self._iter_batches(images, batch_size):
+            launched = (batch, self._launch_torch_batch(batch))
+            if pending:
+                yield from self._collect_torch_batch(*pending)
+            pending = launched
+        if pending:
+            yield from self._collect_torch_batch(*pending)
+
+    def _iter_batches(self, images, batch_size):
+        batch = []
+        for image in images:
+            batch.append(self._load_rgb(image))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _launch_torch_batch(self, imgs):
+        """
+        Transform, upload and run the forward pass for a batch without waiting for it.
+        Returns [(indices, prediction, pinned_input)] per group of equally sized inputs.
+        """
+        inputs = [self.transform(img) for img in imgs]
+        
+        # MiDaS transforms keep aspect ratio, so only equally sized inputs can share a forward pass
+        groups = {}
+        for idx, tensor in enumerate(inputs):
+            groups.setdefault(tuple(tensor.shape[-2:]), []).append(idx)
+        
+        use_cuda = self.torch_device.type == "cuda"
+        if use_cuda and getattr(self, "_copy_stream", None) is None:
+            self._copy_stream = torch.cuda.Stream(device=self.torch_device)
+        
+        launched = []
+        with torch.inference_mode():
+            for indices in groups.values():
+                input_batch = torch.cat([inputs[k] for k in indices])
+                if use_cuda:
+                    # Pinned host memory + a side stream: the copy overlaps kernels already queued
+                    input_batch = input_batch.pin_memory()
+                    compute_stream = torch.cuda.current_stream(self.torch_device)
+                    with torch.cuda.stream(self._copy_stream):
+                        device_batch = input_batch.to(self.torch_device, dtype=self.input_dtype, non_blocking=True)
+                    compute_stream.wait_stream(self._copy_stream)
+                    device_batch.record_stream(compute_stream)
+                else:
+                    device_batch = input_batch.to(self.torch_device, dtype=self.input_dtype)
+                device_batch = device_batch.contiguous(memory_format=self.memory_format)
+                # Keep the pinned source alive until the asynchronous copy has completed
+                launched.append((indices, self.model(device_batch).float(), input_batch))
+        return launched
+
+    def _collect_torch_batch(self, imgs, launched):
+        results = [None] * len(imgs)
+        with torch.inference_mode():
+            for indices, prediction, _ in launched:
+                out_sizes = {imgs[k].shape[:2] for k in indices}
+                if len(out_sizes) == 1:
+                    # Common case (same camera): resize and normalize the whole group at once
+                    depth = self._upsample_normalize(prediction, out_sizes.pop())
+                    for row, k in enumerate(indices):
+                        results[k] = depth[row]
+                    continue
+                
+                for row, k in enumerate(indices):
+                    results[k] = self._upsample_normalize(prediction[row:row + 1], imgs[k].shape[:2])[0]
+        return results
+
+    @staticmethod
+    def _normalize_torch(depth):
+        """
+        Same as _normalize, computed on the tensor's device (no extra host pass, no sync).
+        Leading dimensions are treated as a batch: each (H, W) map is normalized on its own.
+        """
+        depth_min = depth.amin(dim=(-2, -1), keepdim=True)
+        depth_max = depth.amax(dim=(-2, -1), keepdim=True)
+        depth_range = depth_max - depth_min
+        normalized = (depth - depth_min) / depth_range.clamp_min(1e-6)
+        return torch.where(depth_range > 1e-6, normalized, torch.zeros_like(depth))
 
     def _normalize(self, depth_map):
         depth_min = depth_map.min()
@@ -169,13 +493,54 @@ class DepthEstimator:
         
         return filled_depth
 
-    def save_depth_map(self, depth_map, output_path):
+    def save_depth_map(self, depth_map, output_path, format="png16"):
         """
-        Save depth map as 16-bit PNG (scaled to 0-65535).
+        Save a normalized depth map.
+        format: "png16" - 16-bit PNG scaled to 0-65535 (for export/viewers)
+                "npy"   - float16 .npy, no encoding cost (intermediate pipeline frames)
+                "lz4"   - float16 .npy bytes in an LZ4 frame (needs the lz4 package)
+        Use load_depth_map to read "npy"/"lz4" files back.
         """
-        # Scale to 16-bit
-        depth_16bit = (depth_map * 65535).astype(np.uint16)
-        cv2.imwrite(output_path, depth_16bit)
+        if format in ("npy", "lz4"):
+            depth_f16 = np.asarray(depth_map, dtype=np.float16)
+            if format == "npy":
+                with open(output_path, 'wb') as f:
+                    np.save(f, depth_f16)
+                return
+            if not HAS_LZ4:
+                raise ImportError("lz4 is required for format='lz4' (pip install lz4)")
+            buffer = io.BytesIO()
+            np.save(buffer, depth_f16)
+            with open(output_path, 'wb') as f:
+                f.write(lz4.frame.compress(buffer.getbuffer(), compression_level=0))
+            return
+        if format != "png16":
+            raise ValueError(f"Unknown depth map format: {format}")
+        
+        if self._u16_buf is None or self._u16_buf.shape != depth_map.shape:
+            self._f32_buf = np.empty(depth_map.shape, dtype=np.float32)
+            self._u16_buf = np.empty(depth_map.shape, dtype=np.uint16)
+        
+        # Scale to 16-bit (saturating) without per-call temporaries
+        np.multiply(depth_map, 65535.0, out=self._f32_buf, casting="unsafe")
+        np.clip(self._f32_buf, 0, 65535, out=self._f32_buf)
+        np.copyto(self._u16_buf, self._f32_buf, casting="unsafe")
+        # Fast PNG compression level: encoding dominates when writing thousands of frames
+        cv2.imwrite(output_path, self._u16_buf, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+
+    @staticmethod
+    def load_depth_map(path):
+        """Load a depth map written by save_depth_map as float32 (0..1)."""
+        if str(path).endswith(".png"):
+            depth_16bit = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
+            return depth_16bit.astype(np.float32) / 65535.0
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:4] == b"\x04\x22\x4d\x18":  # LZ4 frame magic
+            if not HAS_LZ4:
+                raise ImportError("lz4 is required to read LZ4 depth maps (pip install lz4)")
+            data = lz4.frame.decompress(data)
+        return np.load(io.BytesIO(data)).astype(np.float32)
 
 if __name__ == "__main__":
     # Test
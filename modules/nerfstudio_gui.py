@@ -10,12 +10,40 @@ Provides Flet UI components for NerfStudio integration including:
 import flet as ft
 import subprocess
 import threading
+import queue
+import itertools
+import logging
 import os
+from concurrent.futures import Future
+from collections import deque
 from pathlib import Path
 from typing import Callable, Optional
-from .nerfstudio_trainer import NerfStudioTrainer
+from .nerfstudio_trainer import NerfStudioTrainer, _NO_WINDOW
 from .neural_enhancer import NeuralEnhancer
 
+logger = logging.getLogger("QuestGear3D.NerfStudioGUI")
+
+# pip install arguments for the dedicated NerfStudio env (appended to "<python> -m pip install")
+# PyTorch with CUDA 11.8 for broader compatibility (Quadro P600, etc.)
+_TORCH_PIP_ARGS = (
+    "torch==2.1.2+cu118", "torchvision==0.16.2+cu118", "torchaudio==2.1.2+cu118",
+    "--index-url", "https://download.pytorch.org/whl/cu118",
+    "--no-cache-dir",
+    "--force-reinstall",
+)
+# gsplat from the official wheel repo with CUDA binaries, pinned to 1.4.0 for stability with older GPUs
+_GSPLAT_PIP_ARGS = (
+    "gsplat==1.4.0",
+    "--find-links", "https://docs.gsplat.studio/whl/",
+    "--no-cache-dir",
+    "--no-deps",
+    "--force-reinstall",
+)
+_NERFSTUDIO_PIP_ARGS = (
+    "numpy<2.0.0", "nerfstudio==1.1.5", "nerfacc", "viser", "tensorboard",
+    "--no-warn-script-location",
+)
+
 
 class NerfStudioUI:
     """Manages NerfStudio UI components and state."""
@@ -27,7 +55,17 @@ class NerfStudioUI:
         self.config_manager = config_manager
         self.trainer = NerfStudioTrainer()
         self.is_installed = False
-        self.installation_thread = None
+        self.installation_future = None
+        # Install/uninstall/check run one at a time on a single persistent daemon worker
+        self._admin_tasks = queue.Queue()
+        self._admin_worker = None
+        self._ns_python = None
+        self._deep_check_done = False  # interpreter import probe ran since the last (un)install
+        
+        # Last dropdown selections applied, so re-selecting one skips the config save and page update
+        self._last_method = None
+        self._last_preset = None
+        self._last_progress = None  # (step, total, eta, loss, psnr) last shown
         
         # Batch Processing
         self.batch_queue = []
@@ -42,49 +80,99 @@ class NerfStudioUI:
     
     def start_installation_check(self):
         """Start background installation check. Call this after page is fully loaded."""
-        threading.Thread(target=self._check_installation_async, daemon=True).start()
+        self._submit_installation_check()
+    
+    def _submit_installation_check(self, **kwargs):
+        """Queue an installation check. Nobody reads its Future, so failures are logged here."""
+        future = self._submit_admin_task(self._check_installation_async, **kwargs)
+        future.add_done_callback(self._log_installation_check_failure)
+    
+    @staticmethod
+    def _log_installation_check_failure(future: Future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.error("Installation check failed", exc_info=future.exception())
+    
+    def _submit_admin_task(self, fn, **kwargs) -> Future:
+        """Queue fn on the admin worker; tasks run in submission order, never concurrently."""
+        future = Future()
+        self._admin_tasks.put((future, fn, kwargs))
+        if self._admin_worker is None:
+            self._admin_worker = threading.Thread(target=self._admin_worker_loop, daemon=True)
+            self._admin_worker.start()
+        return future
+    
+    def _admin_worker_loop(self):
+        while True:
+            future, fn, kwargs = self._admin_tasks.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(**kwargs))
+            except BaseException as ex:
+                future.set_exception(ex)
+    
+    def _installation_running(self) -> bool:
+        return self.installation_future is not None and not self.installation_future.done()
     
     def _get_nerfstudio_python(self) -> str:
         """Get path to the dedicated NerfStudio python executable."""
-        # Use a separate venv for NerfStudio to avoid conflicts
-        venv_name = "nerfstudio_venv"
-        return os.path.abspath(os.path.join(os.getcwd(), venv_name, "Scripts", "python.exe"))
+        if self._ns_python is None:
+            # Use a separate venv for NerfStudio to avoid conflicts
+            venv_name = "nerfstudio_venv"
+            self._ns_python = os.path.abspath(os.path.join(os.getcwd(), venv_name, "Scripts", "python.exe"))
+        return self._ns_python
 
-    def _check_installation_async(self):
-        """Check if NerfStudio is installed (in background)."""
-        import time
-        time.sleep(0.5)  # Small delay to ensure page is ready
-        
+    def _probe_venv(self, ns_python, modules, timeout=60):
+        """
+        Import several modules in one run of the venv interpreter (one cold start for all checks).
+        Returns the set of module names that imported successfully.
+        """
+        script = (
+            "import importlib\n"
+            f"for name in {tuple(modules)!r}:\n"
+            "    try:\n"
+            "        importlib.import_module(name)\n"
+            "        print(name)\n"
+            "    except Exception:\n"
+            "        pass\n"
+        )
+        try:
+            result = subprocess.run(
+                [ns_python, "-c", script],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,  # Suppress error output to avoid debugger breaks
+                text=True,
+                creationflags=_NO_WINDOW,
+                timeout=timeout  # Prevent hanging
+            )
+        except Exception:
+            return set()
+        return set(result.stdout.split())
+
+    def _check_installation_async(self, force=False, importable=None):
+        """
+        Check if NerfStudio is installed (in background).
+        Looks for the package in the venv's site-packages; spawning the venv interpreter to
+        import it costs far more, so that probe only runs with force=True (after install/uninstall
+        or a failed training run). importable: result of a _probe_venv run the caller already made.
+        """
         ns_python = self._get_nerfstudio_python()
+        site_packages = os.path.join(os.path.dirname(os.path.dirname(ns_python)), "Lib", "site-packages")
         
         # Check if python exists in separate env
         if not os.path.exists(ns_python):
             self.is_installed = False
+        elif importable is not None:
+            self.is_installed = "nerfstudio" in importable
+            self._deep_check_done = True
+        elif not force:
+            self.is_installed = os.path.isfile(os.path.join(site_packages, "nerfstudio", "__init__.py"))
         else:
             # Check if nerfstudio is importable in that env
-            try:
-                cmd = [ns_python, "-c", "import nerfstudio; print('ok')"]
-                # Use subprocess to check without raising exception if module missing
-                result = subprocess.run(
-                    cmd, 
-                    stdout=subprocess.PIPE, 
-                    stderr=subprocess.PIPE, 
-                    creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0,
-                    check=False  # Don't raise CalledProcessError
-                )
-                self.is_installed = (result.returncode == 0)
-            except Exception:
-                self.is_installed = False
+            self.is_installed = "nerfstudio" in self._probe_venv(ns_python, ("nerfstudio",))
+            self._deep_check_done = True
         
-        # Update UI on main thread (safely)
-        try:
-            self._update_installation_status()
-        except:
-            # If page not ready, try with run_task
-            try:
-                self.page.run_task(self._update_installation_status)
-            except:
-                pass  # Silently fail if page still not ready
+        self._update_installation_status()
 
     def _update_installation_status(self):
         """Update UI based on installation status."""
@@ -94,7 +182,6 @@ class NerfStudioUI:
             self.btn_install.text = "Update NerfStudio"
             self.btn_install.icon = ft.Icons.SYSTEM_UPDATE
             self.btn_uninstall.visible = True  # Show uninstall when installed
-            self.btn_uninstall.visible = True  # Show uninstall when installed
             self.training_container.disabled = False
             self.batch_container.disabled = False
             self.history_container.disabled = False
@@ -241,8 +328,20 @@ class NerfStudioUI:
         )
         # Thread safety lock for logs
         self.log_lock = threading.Lock()
-        self.log_buffer = []
+        # Bounded: a flush shows at most the last 50 lines, so a runaway trainer cannot grow it.
+        # deque append/popleft are atomic, so producers and the updater share it without log_lock.
+        self.log_buffer = deque(maxlen=500)
+        self._log_has_data = threading.Event()
+        # Entries are (line, seq) numbered by a C-level counter; the updater counts lines the
+        # deque evicted from gaps in seq, so producers never take a lock
+        self._log_seq = itertools.count()
+        self._log_next_seq = 0  # first seq the updater has not accounted for yet
         self.is_log_updater_running = False
+        self.install_log_buffer = []
+        self.is_install_log_updater_running = False
+        self._ui_dirty = threading.Event()
+        self._ui_flusher = None
+        self._ui_flusher_lock = threading.Lock()
         
         self.training_container = ft.Container(
             content=ft.Column([
@@ -442,7 +541,10 @@ class NerfStudioUI:
     def _on_method_change(self, e):
         """Update description when method changes."""
         method = e.control.value
+        if method == self._last_method:
+            return
         if method in NerfStudioTrainer.METHODS:
+            self._last_method = method
             self.config_manager.set("nerfstudio.method", method)
             info = NerfStudioTrainer.METHODS[method]
             self.method_description.value = f"{info['description']} | Speed: {info['speed']}, Quality: {info['quality']}"
@@ -452,28 +554,28 @@ class NerfStudioUI:
         """Update training parameters based on preset."""
         preset = e.control.value
         if preset in NerfStudioTrainer.PRESETS:
-            self.config_manager.set("nerfstudio.preset", preset)
             config = NerfStudioTrainer.PRESETS[preset]
+            # Re-selecting a preset still resets iterations the user edited by hand
+            if preset == self._last_preset and self.iterations_input.value == str(config['max_iterations']):
+                return
+            self._last_preset = preset
+            self.config_manager.set("nerfstudio.preset", preset)
             self.iterations_input.value = str(config['max_iterations'])
             self.config_manager.set("nerfstudio.max_iterations", config['max_iterations'])
             self.page.update()
     
     def _on_install_click(self, e):
         """Handle install/update button click."""
-        if self.installation_thread and self.installation_thread.is_alive():
+        if self._installation_running():
             self._show_message("Installation already in progress")
             return
         
         self.btn_install.disabled = True
         self.install_progress.visible = True
-        self.install_log.value = "Starting installation..."
         self.page.update()
+        self._update_install_log("Starting installation...")
         
-        self.installation_thread = threading.Thread(
-            target=self._install_nerfstudio,
-            daemon=True
-        )
-        self.installation_thread.start()
+        self.installation_future = self._submit_admin_task(self._install_nerfstudio)
     
     def _on_uninstall_click(self, e):
         """Show confirmation dialog for uninstallation."""
@@ -501,21 +603,17 @@ class NerfStudioUI:
 
     def _do_uninstall(self):
         """Start the uninstallation thread."""
-        if self.installation_thread and self.installation_thread.is_alive():
+        if self._installation_running():
             self._show_message("A process is already in progress")
             return
             
         self.btn_install.disabled = True
         self.btn_uninstall.disabled = True
         self.install_progress.visible = True
-        self.install_log.value = "Starting uninstallation..."
         self.page.update()
+        self._update_install_log("Starting uninstallation...")
         
-        self.installation_thread = threading.Thread(
-            target=self._uninstall_nerfstudio,
-            daemon=True
-        )
-        self.installation_thread.start()
+        self.installation_future = self._submit_admin_task(self._uninstall_nerfstudio)
 
     def _uninstall_nerfstudio(self):
         """Uninstall NerfStudio using pip."""
@@ -538,23 +636,18 @@ class NerfStudioUI:
                 stderr=subprocess.STDOUT,
                 text=True,
                 bufsize=1,
-                creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+                creationflags=_NO_WINDOW
             )
             
-            for line in process.stdout:
-                line = line.strip()
-                if line:
-                    self._update_install_log(line)
-            
-            if process.wait() == 0:
+            if self._stream_proc(process) == 0:
                 self._update_install_log("✅ Uninstallation successful!")
                 self.on_log("NerfStudio uninstalled")
             else:
                 self._update_install_log("❌ Uninstallation failed")
                 self.on_log("NerfStudio uninstallation failed")
                 
-            # Re-check status
-            threading.Thread(target=self._check_installation_async, daemon=True).start()
+            # Re-check status once this task has finished
+            self._submit_installation_check(force=True)
             
         except Exception as ex:
             self._update_install_log(f"❌ Error: {ex}")
@@ -567,6 +660,20 @@ class NerfStudioUI:
             self.install_progress.visible = False
             self.page.update()
     
+    def _stream_proc(self, proc, line_filter=None):
+        """
+        Forward a subprocess' merged stdout/stderr to the install log and wait for it.
+        line_filter maps a stripped line to the text to log, or None to drop it.
+        Lines only go into the log buffer here, so pip is never held up by UI updates.
+        """
+        for line in proc.stdout:
+            line = line.strip()
+            if line and line_filter is not None:
+                line = line_filter(line)
+            if line:
+                self._update_install_log(line)
+        return proc.wait()
+    
     def _install_nerfstudio(self):
         """Install/update NerfStudio in dedicated env."""
         import sys
@@ -584,95 +691,66 @@ class NerfStudioUI:
                 venv.create(venv_dir, with_pip=True)
                 self._update_install_log("✅ Environment created.")
 
-            # 2. Upgrade pip
-            self._update_install_log("Upgrading pip...")
-            subprocess.run([target_python, "-m", "pip", "install", "--upgrade", "pip"], 
-                           creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0)
+            # 2. Upgrade pip (at most once a week - the marker's mtime records the last upgrade)
+            import time
+            pip_marker = os.path.join(venv_dir, ".pip_upgrade_ts")
+            if os.path.exists(pip_marker) and time.time() - os.path.getmtime(pip_marker) < 7 * 86400:
+                self._update_install_log("pip upgraded recently, skipping.")
+            else:
+                self._update_install_log("Upgrading pip...")
+                pip_result = subprocess.run([target_python, "-m", "pip", "install", "--upgrade", "pip"], 
+                                            creationflags=_NO_WINDOW)
+                if pip_result.returncode == 0:
+                    Path(pip_marker).touch()
 
             # 3. Install PyTorch with CUDA (Critical Step!)
             # Updated to CUDA 11.8 for broader compatibility (Quadro P600, etc.)
             self._update_install_log("Step 1/3: Installing PyTorch (cuda 11.8)...")
-            torch_cmd = [
-                target_python, "-m", "pip", "install", 
-                "torch==2.1.2+cu118", "torchvision==0.16.2+cu118", "torchaudio==2.1.2+cu118",
-                "--index-url", "https://download.pytorch.org/whl/cu118",
-                "--no-cache-dir",
-                "--force-reinstall"
-            ]
+            torch_cmd = [target_python, "-m", "pip", "install", *_TORCH_PIP_ARGS]
             
             proc = subprocess.Popen(
                 torch_cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+                creationflags=_NO_WINDOW
             ) 
-            for line in proc.stdout:
-                if line.strip(): self._update_install_log(line.strip())
-            proc.wait()
+            self._stream_proc(proc)
 
             # 4. Install NerfStudio & Dependencies
             self._update_install_log("Step 2/3: Installing NerfStudio & core libs...")
-            self._update_install_log("  → Ensuring numpy compatibility (<2.0)...")
-            subprocess.run([target_python, "-m", "pip", "install", "numpy<2.0.0"], 
-                           creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0)
-            
             # gsplat needs special handling - install from official wheel repo with CUDA binaries
             # Pinned to 1.4.0 for stability with older GPUs
             self._update_install_log("  → Installing gsplat 1.4.0 with CUDA support...")
-            gsplat_cmd = [
-                target_python, "-m", "pip", "install", 
-                "gsplat==1.4.0",
-                "--find-links", "https://docs.gsplat.studio/whl/",
-                "--no-cache-dir",
-                "--no-deps",
-                "--force-reinstall"
-            ]
+            gsplat_cmd = [target_python, "-m", "pip", "install", *_GSPLAT_PIP_ARGS]
             proc_gsplat = subprocess.Popen(
                 gsplat_cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+                creationflags=_NO_WINDOW
+            )
+            self._stream_proc(
+                proc_gsplat,
+                line_filter=lambda line: f"    {line}" if ('ERROR' in line or 'Successfully' in line) else None
             )
-            for line in proc_gsplat.stdout:
-                 if line.strip() and ('ERROR' in line or 'Successfully' in line): 
-                     self._update_install_log(f"    {line.strip()}")
-            proc_gsplat.wait()
             
-            # Install remaining components
-            self._update_install_log("  → Installing nerfstudio and dependencies...")
-            ns_cmd = [
-                target_python, "-m", "pip", "install", 
-                "nerfstudio==1.1.5", "nerfacc", "viser", "tensorboard",
-                "--no-warn-script-location"
-            ]
+            # Install remaining components in one resolver run; numpy pinned for compatibility (<2.0)
+            self._update_install_log("  → Installing nerfstudio and dependencies (numpy<2.0)...")
+            ns_cmd = [target_python, "-m", "pip", "install", *_NERFSTUDIO_PIP_ARGS]
             
             proc = subprocess.Popen(
                 ns_cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+                creationflags=_NO_WINDOW
             )
-            for line in proc.stdout:
-                 if line.strip(): self._update_install_log(line.strip())
-            
-            if proc.wait() == 0:
-                # Verify gsplat installation (silently)
-                try:
-                    verify_cmd = [target_python, "-c", "from gsplat import csrc; print('OK')"]
-                    verify_result = subprocess.run(
-                        verify_cmd, 
-                        capture_output=True, 
-                        text=True,
-                        stderr=subprocess.DEVNULL,  # Suppress error output to avoid debugger breaks
-                        creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0,
-                        timeout=10  # Prevent hanging
-                    )
-                    gsplat_ok = (verify_result.returncode == 0)
-                except Exception:
-                    gsplat_ok = False
+            importable = None
+            if self._stream_proc(proc) == 0:
+                # Verify gsplat and nerfstudio in one interpreter run (silently)
+                importable = self._probe_venv(target_python, ("nerfstudio", "gsplat.csrc"))
+                gsplat_ok = "gsplat.csrc" in importable
                 
                 if not gsplat_ok:
                     self._update_install_log("⚠️  gsplat installation incomplete (missing CUDA binaries)")
@@ -691,8 +769,8 @@ class NerfStudioUI:
             else:
                 self._update_install_log("❌ Installation failed.")
             
-            # Refresh status
-            self._check_installation_async()
+            # Refresh status (reuses the probe above when the install succeeded)
+            self._check_installation_async(force=True, importable=importable)
             
         except Exception as ex:
             self._update_install_log(f"❌ Error: {ex}")
@@ -700,9 +778,6 @@ class NerfStudioUI:
             self._update_install_log(traceback.format_exc())
         
         finally:
-            self.btn_install.disabled = False
-            self.install_progress.visible = False
-            self.page.update()
             self._installation_complete()
     
     def _installation_complete(self):
@@ -712,16 +787,45 @@ class NerfStudioUI:
         self.page.update()
     
     def _update_install_log(self, text: str):
-        """Append text to install log."""
-        self.install_log.controls.append(ft.Text(text, size=11, font_family="Consolas", selectable=True))
-        if len(self.install_log.controls) > 1000:
-            self.install_log.controls.pop(0)
+        """Append text to install log - Thread Safe & Buffered."""
+        should_start = False
+        with self.log_lock:
+            self.install_log_buffer.append(text)
+            if not self.is_install_log_updater_running:
+                self.is_install_log_updater_running = True
+                should_start = True
+        
+        if should_start:
+            threading.Thread(target=self._install_log_updater_loop, daemon=True).start()
+    
+    def _install_log_updater_loop(self):
+        """Flush buffered install log lines with one page update per tick (pip emits thousands)."""
+        import time
+        while True:
+            time.sleep(0.1)
+            with self.log_lock:
+                lines, self.install_log_buffer = self.install_log_buffer, []
+                if not lines and not self._installation_running():
+                    self.is_install_log_updater_running = False
+                    return
+            
+            if not lines:
+                continue
+            
+            self.install_log.controls.extend(
+                ft.Text(line, size=11, font_family="Consolas", selectable=True) for line in lines
+            )
+            if len(self.install_log.controls) > 1000:
+                del self.install_log.controls[:-1000]
 
-        # Ensure log container is visible
-        if hasattr(self, 'install_log_container'):
-            self.install_log_container.visible = True
+            # Ensure log container is visible
+            if hasattr(self, 'install_log_container'):
+                self.install_log_container.visible = True
 
-        self.page.update()
+            try:
+                self.page.update()
+            except Exception:
+                pass # Page might be closed or busy
 
     
     def _on_train_click(self, e):
@@ -753,6 +857,7 @@ class NerfStudioUI:
         self.training_progress.visible = True
         self.training_progress.value = 0
         self.progress_text.value = "Initializing..."
+        self._last_progress = None
         self.output_path_text.value = "" # Clear previous path
         self.page.update()
         
@@ -782,8 +887,6 @@ class NerfStudioUI:
     
     def _on_training_log(self, line: str):
         """Handle raw log output from training - Thread Safe & Buffered."""
-        should_start = False
-        
         # Handle carriage returns and newlines (prevent excessive empty lines)
         if '\r' in line:
             line = line.replace('\r', '\n')
@@ -794,61 +897,74 @@ class NerfStudioUI:
         if not segments:
             return
 
-        with self.log_lock:
-            self.log_buffer.extend(segments)
-            if not self.is_log_updater_running:
-                self.is_log_updater_running = True
-                should_start = True
+        # Segments first: zip stops on them without drawing a spare number from the counter
+        self.log_buffer.extend(zip(segments, self._log_seq))
+        self._log_has_data.set()
         
-        if should_start:
+        if not self.is_log_updater_running and self._claim_log_updater():
             threading.Thread(target=self._log_updater_loop, daemon=True).start()
     
+    def _claim_log_updater(self) -> bool:
+        """Mark the training log updater as running; False if another thread already owns it."""
+        with self.log_lock:
+            if self.is_log_updater_running:
+                return False
+            self.is_log_updater_running = True
+            return True
+    
     def _log_updater_loop(self):
         """Accumulate logs and update UI periodically."""
         import time
-        while self.log_buffer or self.trainer.is_running:
-            # If buffer empty, wait a bit
+        while True:
             if not self.log_buffer:
-                time.sleep(0.5)
-                continue
+                if self.trainer.is_running:
+                    # Idle until a producer signals new lines (re-checking is_running twice a second)
+                    self._log_has_data.wait(timeout=0.5)
+                    self._log_has_data.clear()
+                    continue
+                with self.log_lock:
+                    self.is_log_updater_running = False
+                # Lines appended after the check above saw the flag still set - take them over
+                if self.log_buffer and self._claim_log_updater():
+                    continue
+                return
                 
             # Grab all pending logs
-            with self.log_lock:
-                lines = self.log_buffer[:]
-                self.log_buffer.clear()
-            
-            if not lines:
-                continue
+            entries = [self.log_buffer.popleft() for _ in range(len(self.log_buffer))]
+            lines = [line for line, _ in entries]
+
+            # Lines evicted by the deque's maxlen show up as skipped sequence numbers
+            last_seq = entries[-1][1]
+            dropped = max(0, last_seq + 1 - self._log_next_seq - len(entries))
+            self._log_next_seq = max(self._log_next_seq, last_seq + 1)
 
             # Performance: If we have too many logs pending (lag), just show the latest ones
-            # to prevent freezing the UI with thousands of updates.
-            if len(lines) > 50:
-                lines = lines[-50:]
-                lines.insert(0, "... [skipped info logs due to high volume] ...")
+            if len(lines) > 200:
+                dropped += len(lines) - 200
+                lines = lines[-200:]
+            if dropped:
+                lines.insert(0, f"... [skipped {dropped} log lines due to high volume] ...")
 
-            # Update UI
-            # We use a copy of the list to avoid locking during UI update
-            new_controls = []
-            for line in lines:
-                new_controls.append(
-                    ft.Text(line.rstrip(), size=10, font_family="Consolas", color=ft.Colors.GREEN_400, selectable=True)
-                )
+            # Update UI - one multi-line Text per flush, so a burst costs a single control;
+            # data holds its line count for pruning
+            self.training_log.controls.append(
+                ft.Text("\n".join(lines), size=10, font_family="Consolas", color=ft.Colors.GREEN_400,
+                        selectable=True, data=len(lines))
+            )
             
-            self.training_log.controls.extend(new_controls)
+            # Prune whole flushes, oldest first, until at most 500 lines remain (newest always kept)
+            controls = self.training_log.controls
+            total = sum(c.data for c in controls)
+            drop = 0
+            while total > 500 and drop < len(controls) - 1:
+                total -= controls[drop].data
+                drop += 1
+            if drop:
+                del controls[:drop]
             
-            # Prune if too long
-            if len(self.training_log.controls) > 500:
-                del self.training_log.controls[:len(self.training_log.controls) - 500]
-            
-            try:
-                self.page.update()
-            except Exception:
-                pass # Page might be closed or busy
+            self._request_update()
             
             time.sleep(0.5) # Max 2 updates per second to prevent freezing
-        
-        with self.log_lock:
-            self.is_log_updater_running = False
 
     def _on_stop_click(self, e):
         """Stop training."""
@@ -867,6 +983,12 @@ class NerfStudioUI:
         psnr = info.get('psnr')
         eta = info.get('eta_seconds')
         
+        # Trainer lines often repeat the same step; skip formatting and the page update then
+        progress = (step, total, eta, loss, psnr)
+        if progress == self._last_progress:
+            return
+        self._last_progress = progress
+        
         # Update progress bar
         if total > 0:
             self.training_progress.value = step / total
@@ -885,10 +1007,31 @@ class NerfStudioUI:
         if psnr is not None:
             self.psnr_text.value = f"PSNR: {psnr:.2f} dB"
         
-        try:
-            self.page.update()
-        except:
-            pass
+        self._request_update()
+    
+    def _request_update(self):
+        """
+        Coalesce page updates from background callbacks (training progress, log flushes,
+        batch list, completion) into at most one per 50ms tick.
+        """
+        self._ui_dirty.set()
+        if self._ui_flusher is None:
+            with self._ui_flusher_lock:
+                if self._ui_flusher is None:
+                    self._ui_flusher = threading.Thread(target=self._ui_flush_loop, daemon=True)
+                    self._ui_flusher.start()
+    
+    def _ui_flush_loop(self):
+        """Single long-lived flusher: sleeps until dirty, then one page.update() per 50ms tick."""
+        import time
+        while True:
+            self._ui_dirty.wait()
+            time.sleep(0.05)
+            self._ui_dirty.clear()
+            try:
+                self.page.update()
+            except:
+                pass
     
     def _on_training_complete(self, success: bool, output_path: str):
         """Handle training completion."""
@@ -914,6 +1057,10 @@ class NerfStudioUI:
             self.on_log("❌ Training failed or was cancelled")
             self._show_message("Training failed or was cancelled")
             
+            # The installation check only looked for the package; verify it actually imports
+            if not self._deep_check_done:
+                self._submit_installation_check(force=True)
+            
             # Hide viewer button on failure
             self.btn_open_viewer.visible = False
             
@@ -923,10 +1070,7 @@ class NerfStudioUI:
                 self._update_batch_list()
                 self._start_next_batch_job()
         
-        try:
-            self.page.update()
-        except:
-            pass
+        self._request_update()
     
     def _on_open_viewer(self, e):
         """Open NerfStudio viewer."""
@@ -1024,6 +1168,7 @@ class NerfStudioUI:
         # Add to queue with current settings
         job = {
             'path': path,
+            'name': os.path.basename(path),
             'method': self.method_dropdown.value,
             'iterations': int(self.iterations_input.value),
             'status': 'Pending'
@@ -1038,23 +1183,23 @@ class NerfStudioUI:
         self._update_batch_list()
         
     def _update_batch_list(self):
-        """Update batch list UI."""
-        self.batch_list.controls.clear()
+        """Update batch list UI. Row controls are reused; only rows whose text changed are rewritten."""
+        controls = self.batch_list.controls
+        del controls[len(self.batch_queue):]
         for i, job in enumerate(self.batch_queue):
             status_symbol = "⏳"
             if job['status'] == 'Running': status_symbol = "🔄"
             elif job['status'] == 'Done': status_symbol = "✅"
             elif job['status'] == 'Failed': status_symbol = "❌"
             
-            self.batch_list.controls.append(
-                ft.Text(f"{i+1}. {status_symbol} {os.path.basename(job['path'])} ({job['method']}, {job['iterations']} iters)")
-            )
+            text = f"{i+1}. {status_symbol} {job['name']} ({job['method']}, {job['iterations']} iters)"
+            if i >= len(controls):
+                controls.append(ft.Text(text))
+            elif controls[i].value != text:
+                controls[i].value = text
         
         self.btn_start_batch.disabled = len(self.batch_queue) == 0 or self.is_batch_processing
-        try:
-            self.page.update()
-        except:
-            pass
+        self._request_update()
 
     def _on_start_batch(self, e):
         """Start batch processing."""
@@ -1094,11 +1239,13 @@ class NerfStudioUI:
         # Override temp_dir via getter (trickier) or pass directly to trainer
         # Trainer takes data_path directly, so we are good.
         
-        self.on_log(f"Batch Job {self.current_batch_index+1}/{len(self.batch_queue)}: {os.path.basename(job['path'])}")
+        self.on_log(f"Batch Job {self.current_batch_index+1}/{len(self.batch_queue)}: {job['name']}")
         
         # Update UI to reflect current job
         self.method_dropdown.value = job['method']
         self.iterations_input.value = str(job['iterations'])
+        self.training_progress.value = 0
+        self._last_progress = None
         self.page.update()
         
         # Start training
@@ -1137,6 +1284,7 @@ class NerfStudioUI:
         
     def _do_export(self, config_path, fmt):
         """Run ns-export command."""
+        proc = None
         try:
             # config_path is the directory usually in my implementation logic?
             # self.output_path_text is set in _on_training_complete
@@ -1161,9 +1309,9 @@ class NerfStudioUI:
                     # Let's try 'tsdf' or 'poisson' if supported, or 'marching-cubes'
                     export_type = "marching-cubes" # Standard for density fields
 
-            # Override for splatfacto
+            # Override for splatfacto (scan line by line, stopping at the first match)
             with open(config_file, 'r') as f:
-                if "splatfacto" in f.read():
+                if any("splatfacto" in line for line in f):
                      export_type = "gaussian-splat"
                      if fmt == "obj":
                          # Splat to mesh is hard. Warning?
@@ -1185,37 +1333,56 @@ class NerfStudioUI:
             
             self.on_log(f"Exporting: {' '.join(cmd)}")
             
-            proc = subprocess.run(
+            # Stream output into the training log instead of buffering it all until exit
+            proc = subprocess.Popen(
                 cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+                bufsize=1,
+                encoding='utf-8',       # Same as the trainer: rich progress glyphs are not cp1252
+                errors='replace',
+                creationflags=_NO_WINDOW
             )
+            tail = deque(maxlen=20)
+            for line in proc.stdout:
+                tail.append(line.rstrip())
+                self._on_training_log(line)
             
-            if proc.returncode == 0:
+            if proc.wait() == 0:
                 self.export_status.value = f"✅ Exported to {output_dir}"
                 self.on_log(f"Export successful: {output_dir}")
                 # Open folder
                 os.startfile(output_dir)
             else:
                  self.export_status.value = f"❌ Export failed"
-                 self.on_log(f"Export failed: {proc.stderr}")
+                 self.on_log("Export failed: " + "\n".join(tail))
 
         except Exception as ex:
             self.export_status.value = f"Error: {ex}"
         finally:
+             # Don't leave ns-export running if reading its output failed part-way
+             if proc is not None and proc.poll() is None:
+                 proc.kill()
+                 proc.wait()
              self.btn_export.disabled = False
              self.page.update()
 
     def _refresh_history(self, e):
-        """Refresh model history list."""
-        self.history_list.controls.clear()
-        
+        """Refresh model history list (the outputs/ scan runs in a background thread)."""
+        self.btn_refresh_history.disabled = True
+        self.page.update()
+        threading.Thread(target=self._do_refresh_history, daemon=True).start()
+    
+    def _do_refresh_history(self):
+        """Scan outputs/ for trained models and rebuild the history list."""
+        # Built off to the side so the current list stays visible while outputs/ is scanned
+        controls = []
         try:
             history = self.trainer.get_history()
             
             if not history:
-                self.history_list.controls.append(ft.Text("No trained models found.", color=ft.Colors.GREY))
+                controls.append(ft.Text("No trained models found.", color=ft.Colors.GREY))
             
             for item in history:
                 # Create row for each item
@@ -1237,7 +1404,7 @@ class NerfStudioUI:
                     ),
                 ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
                 
-                self.history_list.controls.append(ft.Container(
+                controls.append(ft.Container(
                     content=row,
                     padding=5,
                     bgcolor="#333333",
@@ -1246,8 +1413,10 @@ class NerfStudioUI:
                 ))
                 
         except Exception as ex:
-             self.history_list.controls.append(ft.Text(f"Error loading history: {ex}", color=ft.Colors.RED))
-             
+             controls.append(ft.Text(f"Error loading history: {ex}", color=ft.Colors.RED))
+        
+        self.history_list.controls = controls
+        self.btn_refresh_history.disabled = False
         self.page.update()
 
     def _on_view_history(self, path):
@@ -1299,7 +1468,7 @@ class NerfStudioUI:
         try:
             subprocess.Popen(
                 cmd,
-                creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+                creationflags=_NO_WINDOW
             )
             
             # Give it a moment to start
@@ -1319,6 +1488,7 @@ class NerfStudioUI:
         self.training_progress.visible = True
         self.training_progress.value = 0
         self.progress_text.value = "Initializing Monocular Depth Estimation..."
+        self._last_progress = None
         self.training_log.controls.clear()
         self.training_log_container.visible = True
         self.page.update()
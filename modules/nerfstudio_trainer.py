@@ -11,6 +11,9 @@ from pathlib import Path
 from typing import Callable, Optional, Dict, Any
 import json
 
+# Hide console windows for child processes on Windows (0 elsewhere)
+_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
 
 class NerfStudioTrainer:
     """Manages NerfStudio training processes."""
@@ -169,7 +172,7 @@ class NerfStudioTrainer:
                 universal_newlines=True,
                 encoding='utf-8',       # Explicitly use UTF-8
                 errors='replace',       # Replace un-decodable bytes instead of crashing
-                creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0,
+                creationflags=_NO_WINDOW,
                 env=env
             )
             
@@ -434,7 +437,7 @@ class NerfStudioTrainer:
                     [ns_train_exe, '--help'],
                     capture_output=True,
                     timeout=5,
-                    creationflags=subprocess.CREATE_NO_WINDOW if hasattr(subprocess, 'CREATE_NO_WINDOW') else 0
+                    creationflags=_NO_WINDOW
                 )
                 return result.returncode == 0
         except:
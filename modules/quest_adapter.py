@@ -6,6 +6,8 @@ import os
 import numpy as np
 from pathlib import Path
 
+from .quest_image_processor import load_json
+
 
 class QuestDataAdapter:
     """Converts Quest 3 camera/pose data to unified frames.json format."""
@@ -68,33 +70,31 @@ class QuestDataAdapter:
         transforms_file = extraction_path / "transforms.json"
         
         if scan_data_file.exists():
-            with open(scan_data_file, 'r') as f:
-                scan_data = json.load(f)
+            scan_data = load_json(scan_data_file)
         else:
             raise FileNotFoundError("scan_data.json not found in new format scan")
         
         # Load camera intrinsics from transforms.json if available
         camera_metadata = {}
         if transforms_file.exists():
-            with open(transforms_file, 'r') as f:
-                transforms = json.load(f)
-                intrinsics_data = {
-                    'width': transforms.get('w', 1280),
-                    'height': transforms.get('h', 720),
-                    'fx': transforms.get('fl_x', 300.0),
-                    'fy': transforms.get('fl_y', 300.0),
-                    'cx': transforms.get('cx', 640.0),
-                    'cy': transforms.get('cy', 360.0),
-                    'fov_x': transforms.get('camera_angle_x', 0.0),
-                    'fov_y': transforms.get('camera_angle_y', 0.0)
-                }
-                # Store under 'center' camera key (matching frame camera name)
-                # and as 'intrinsics' (what pipeline.get_camera_intrinsics expects)
-                camera_metadata = {
-                    'center': {
-                        'intrinsics': intrinsics_data
-                    }
+            transforms = load_json(transforms_file)
+            intrinsics_data = {
+                'width': transforms.get('w', 1280),
+                'height': transforms.get('h', 720),
+                'fx': transforms.get('fl_x', 300.0),
+                'fy': transforms.get('fl_y', 300.0),
+                'cx': transforms.get('cx', 640.0),
+                'cy': transforms.get('cy', 360.0),
+                'fov_x': transforms.get('camera_angle_x', 0.0),
+                'fov_y': transforms.get('camera_angle_y', 0.0)
+            }
+            # Store under 'center' camera key (matching frame camera name)
+            # and as 'intrinsics' (what pipeline.get_camera_intrinsics expects)
+            camera_metadata = {
+                'center': {
+                    'intrinsics': intrinsics_data
                 }
+            }
         
         # Convert scan_data frames to frames.json format
         frames = []
@@ -197,12 +197,10 @@ class QuestDataAdapter:
         
         cameras = {}
         if left_cam_file.exists():
-            with open(left_cam_file, 'r') as f:
-                cameras['left'] = json.load(f)
+            cameras['left'] = load_json(left_cam_file)
         
         if right_cam_file.exists():
-            with open(right_cam_file, 'r') as f:
-                cameras['right'] = json.load(f)
+            cameras['right'] = load_json(right_cam_file)
         
         # Scan for image files
         left_images = sorted([f.name for f in (extraction_path / "left_camera_raw").iterdir() if f.suffix == '.yuv'])
@@ -6,6 +6,12 @@ import os
 from pathlib import Path
 import struct
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # Lazy load cv2
 cv2 = None
 
@@ -16,17 +22,24 @@ def _ensure_cv2():
         cv2 = cv2_module
     return cv2
 
+def load_json(json_path):
+    """Parse a JSON file, using orjson when installed (frames.json holds every frame of a scan)."""
+    if HAS_ORJSON:
+        with open(json_path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(json_path, 'r') as f:
+        return json.load(f)
+
 class QuestImageProcessor:
     """Processes Quest YUV images and raw depth maps."""
     
     @staticmethod
     def load_image_format_info(json_path):
         """Load Quest image format information from JSON."""
-        with open(json_path, 'r') as f:
-            return json.load(f)
+        return load_json(json_path)
     
     @staticmethod
-    def yuv420_to_rgb(yuv_path, width, height):
+    def yuv420_to_rgb(yuv_path, width, height, color_mode='rgb'):
         """
         Convert YUV_420_888 to RGB.
         
@@ -34,9 +47,10 @@ class QuestImageProcessor:
             yuv_path: Path to .yuv file
             width: Image width
             height: Image height
+            color_mode: 'rgb', or 'gray' to return the Y plane only
             
         Returns:
-            RGB image as numpy array (H, W, 3) uint8
+            RGB image as numpy array (H, W, 3) uint8 ((H, W) for 'gray')
         """
         # YUV_420_888 format:
         # Y plane: width * height
@@ -47,10 +61,7 @@ class QuestImageProcessor:
         uv_size = (width // 2) * (height // 2)
         expected_size = y_size + 2 * uv_size
         
-        with open(yuv_path, 'rb') as f:
-            yuv_data = f.read()
-        
-        actual_size = len(yuv_data)
+        actual_size = os.path.getsize(yuv_path)
         if actual_size < expected_size:
             raise ValueError(
                 f"YUV file too small: {actual_size} bytes, "
@@ -59,27 +70,11 @@ class QuestImageProcessor:
             )
         
         # Note: Quest YUV files may have padding/extra data
-        # Use only the expected amount
-        yuv_data = yuv_data[:expected_size]
-        
-        # Extract Y, U, V planes
-        y_plane = np.frombuffer(yuv_data[:y_size], dtype=np.uint8).reshape((height, width))
-        u_plane = np.frombuffer(yuv_data[y_size:y_size + uv_size], dtype=np.uint8).reshape((height // 2, width // 2))
-        v_plane = np.frombuffer(yuv_data[y_size + uv_size:y_size + 2 * uv_size], dtype=np.uint8).reshape((height // 2, width // 2))
-        
-        cv2 = _ensure_cv2()
-        
-        # Upsample U and V to full resolution
-        u_upsampled = cv2.resize(u_plane, (width, height), interpolation=cv2.INTER_LINEAR)
-        v_upsampled = cv2.resize(v_plane, (width, height), interpolation=cv2.INTER_LINEAR)
-        
-        # Stack into YUV image
-        yuv_image = np.stack([y_plane, u_upsampled, v_upsampled], axis=-1)
-        
-        # Convert YUV to RGB using OpenCV
-        rgb_image = cv2.cvtColor(yuv_image, cv2.COLOR_YUV2RGB)
-        
-        return rgb_image
+        # Map only the expected amount - the page cache backs the array, no read() copy
+        yuv_buffer = np.memmap(yuv_path, dtype=np.uint8, mode='r', shape=(expected_size,))
+
+        from .image_processing import yuv_to_rgb
+        return yuv_to_rgb(yuv_buffer, width, height, layout="i420", mode=color_mode)
     
     @staticmethod
     def load_depth_descriptor(csv_path, timestamp):
@@ -133,22 +128,49 @@ class QuestImageProcessor:
         Returns:
             Depth map as numpy array (H, W) float32
         """
-        with open(depth_path, 'rb') as f:
-            depth_data = f.read()
-        
         # Each pixel is a float32 (4 bytes)
         expected_size = width * height * 4
-        if len(depth_data) != expected_size:
-            raise ValueError(f"Depth file size mismatch: {len(depth_data)} bytes, expected {expected_size}")
+        actual_size = os.path.getsize(depth_path)
+        if actual_size != expected_size:
+            raise ValueError(f"Depth file size mismatch: {actual_size} bytes, expected {expected_size}")
         
-        # Read as float32 array
-        depth_array = np.frombuffer(depth_data, dtype=np.float32)
-        depth_map = depth_array.reshape((height, width))
+        # Map as float32 array (copy-on-write so callers can still clean values in place)
+        depth_map = np.memmap(depth_path, dtype=np.float32, mode='c', shape=(height, width))
         
         return depth_map
     
     @staticmethod
-    def process_quest_frame(project_dir, frame_info, camera='left'):
+    def build_file_index(project_dir, frames):
+        """
+        List the files a capture references with one os.scandir per directory.
+        
+        Args:
+            project_dir: Path to Quest project directory
+            frames: Frame dictionaries from frames.json
+            
+        Returns:
+            Set of existing file Paths, for process_quest_frame(file_index=...)
+        """
+        rel_dirs = {''}
+        for frame in frames:
+            for camera_data in frame.get('cameras', {}).values():
+                for key in ('image', 'depth'):
+                    rel_path = camera_data.get(key)
+                    if rel_path:
+                        rel_dirs.add(os.path.dirname(rel_path))
+        
+        project_path = Path(project_dir)
+        file_index = set()
+        for rel_dir in rel_dirs:
+            try:
+                with os.scandir(project_path / rel_dir) as entries:
+                    file_index.update(Path(e.path) for e in entries if e.is_file())
+            except OSError:
+                continue
+        return file_index
+    
+    @staticmethod
+    def process_quest_frame(project_dir, frame_info, camera='left', color_mode='rgb', file_index=None):
         """
         Process a single Quest frame (YUV + depth or JPG + PNG).
         Auto-detects format based on file extensions.
@@ -157,11 +179,17 @@ class QuestImageProcessor:
             project_dir: Path to Quest project directory
             frame_info: Frame dictionary from frames.json
             camera: 'left', 'right', or 'center' (for new format)
+            color_mode: 'rgb', or 'gray' to load only luminance (H, W) and skip colour conversion
+            file_index: Optional set from build_file_index, replaces per-file exists() checks
             
         Returns:
             Tuple of (rgb_image, depth_map, depth_info) or (None, None, None) if failed
         """
         project_path = Path(project_dir)
+        if file_index is not None:
+            exists = file_index.__contains__
+        else:
+            exists = Path.exists
         
         try:
             # Check which camera format we're using
@@ -180,7 +208,7 @@ class QuestImageProcessor:
             
             image_path = project_path / image_path_rel
             
-            if not image_path.exists():
+            if not exists(image_path):
                 return None, None, None
             
             # Auto-detect image format by extension
@@ -191,18 +219,22 @@ class QuestImageProcessor:
             
             # NEW FORMAT: JPG/PNG
             if image_ext in ['.jpg', '.jpeg', '.png']:
-                rgb_image = cv2.imread(str(image_path))
+                if color_mode == 'gray':
+                    rgb_image = cv2.imread(str(image_path), cv2.IMREAD_GRAYSCALE)
+                else:
+                    rgb_image = cv2.imread(str(image_path))
                 if rgb_image is None:
                     return None, None, None
                 
                 # OpenCV loads as BGR, convert to RGB
-                rgb_image = cv2.cvtColor(rgb_image, cv2.COLOR_BGR2RGB)
+                if rgb_image.ndim == 3:
+                    rgb_image = cv2.cvtColor(rgb_image, cv2.COLOR_BGR2RGB)
                 
                 # Load depth if available
                 depth_path_rel = camera_data.get('depth')
                 if depth_path_rel:
                     depth_path = project_path / depth_path_rel
-                    if depth_path.exists():
+                    if exists(depth_path):
                         depth_map = cv2.imread(str(depth_path), cv2.IMREAD_UNCHANGED)
                         
                         if depth_map is not None:
@@ -223,7 +255,7 @@ class QuestImageProcessor:
             elif image_ext == '.yuv':
                 # Load image format info
                 format_json = project_path / f"{camera}_camera_image_format.json"
-                if not format_json.exists():
+                if not exists(format_json):
                     return None, None, None
                 
                 format_info = QuestImageProcessor.load_image_format_info(format_json)
@@ -233,7 +265,7 @@ class QuestImageProcessor:
                 height = format_info.get('height', 480)
                 
                 # Load YUV and convert to RGB
-                rgb_image = QuestImageProcessor.yuv420_to_rgb(str(image_path), width, height)
+                rgb_image = QuestImageProcessor.yuv420_to_rgb(str(image_path), width, height, color_mode)
                 
                 # Load depth map
                 depth_path_rel = camera_data.get('depth')
@@ -241,7 +273,7 @@ class QuestImageProcessor:
                     return rgb_image, None, None
                 
                 depth_path = project_path / depth_path_rel
-                if not depth_path.exists():
+                if not exists(depth_path):
                     return rgb_image, None, None
                 
                 # Load depth descriptor to get dimensions
@@ -249,7 +281,7 @@ class QuestImageProcessor:
                 timestamp = frame_info.get('timestamp', 0)
                 
                 depth_info = None
-                if depth_descriptor_csv.exists():
+                if exists(depth_descriptor_csv):
                     depth_info = QuestImageProcessor.load_depth_descriptor(
                         str(depth_descriptor_csv), 
                         timestamp
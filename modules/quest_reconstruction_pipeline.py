@@ -1,12 +1,18 @@
 """Quest-specific 3D reconstruction pipeline."""
 
+import os
 import json
+import logging
 import numpy as np
 from pathlib import Path
 from threading import Thread
 from datetime import datetime
+from collections import deque
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
 
-from .quest_image_processor import QuestImageProcessor
+from .quest_image_processor import QuestImageProcessor, load_json
+from .image_processing import filter_depth
 from .reconstruction import QuestReconstructor, HAS_OPEN3D, o3d
 from .config_manager import ConfigManager
 from .quest_reconstruction_utils import (
@@ -16,6 +22,8 @@ from .texture_processor import TextureProcessor
 from .pose_refinement import PoseRefiner
 from .monocular_depth import DepthEstimator
 
+logger = logging.getLogger("QuestGear3D.Reconstruction")
+
 
 class QuestReconstructionPipeline:
     """End-to-end reconstruction pipeline for Quest data."""
@@ -39,14 +47,14 @@ class QuestReconstructionPipeline:
         # Load and aggregate frames from all project directories
         self.frames = []
         self.camera_metadata = {} # Global/Merged metadata
+        self._intrinsics_cache = {} # (camera, depth descriptor) -> 3x3 matrix
         
         for p_dir in self.project_dirs:
             frames_json = p_dir / "frames.json"
             if not frames_json.exists():
                 continue
                 
-            with open(frames_json, 'r') as f:
-                data = json.load(f)
+            data = load_json(frames_json)
                 
             # Update camera metadata (last one wins for now, usually identical)
             self.camera_metadata.update(data.get('camera_metadata', {}))
@@ -73,6 +81,12 @@ class QuestReconstructionPipeline:
         Returns:
             3x3 intrinsics matrix
         """
+        # Intrinsics are static per camera/descriptor - build each matrix only once
+        fov_keys = ('width', 'height', 'fov_left', 'fov_right', 'fov_top', 'fov_down')
+        cache_key = (camera,) + (tuple(depth_info.get(k, 0) for k in fov_keys) if depth_info else ())
+        if not debug and cache_key in self._intrinsics_cache:
+            return self._intrinsics_cache[cache_key]
+        
         fx, fy, cx, cy = 0, 0, 0, 0
         computed_from_fov = False
 
@@ -125,6 +139,7 @@ class QuestReconstructionPipeline:
             [0, 0, 1]
         ], dtype=np.float64)
         
+        self._intrinsics_cache[cache_key] = intrinsics
         return intrinsics
     
     def get_camera_extrinsics(self, camera='left'):
@@ -177,6 +192,58 @@ class QuestReconstructionPipeline:
         
         return H
 
+    @staticmethod
+    def _parse_head_poses(frames):
+        """
+        Build Head-to-World matrices (Unity space) for all frames in one pass.
+        
+        Returns:
+            (N, 4, 4) float64 array indexed like `frames`
+        """
+        from scipy.spatial.transform import Rotation as R
+        
+        # fromiter with a known count fills the arrays directly, no nested-list shape discovery
+        n = len(frames)
+        positions = np.fromiter(
+            chain.from_iterable(f['pose']['position'] for f in frames), dtype=np.float64, count=n * 3
+        ).reshape(n, 3)
+        rotations = np.fromiter(
+            chain.from_iterable(f['pose']['rotation'] for f in frames), dtype=np.float64, count=n * 4
+        ).reshape(n, 4)
+        
+        head_poses = np.tile(np.eye(4), (len(frames), 1, 1))
+        if len(frames) > 0:
+            head_poses[:, :3, :3] = R.from_quat(rotations).as_matrix()
+        head_poses[:, :3, 3] = positions
+        return head_poses
+
+    @staticmethod
+    def _to_open3d_camera_poses(unity_camera_poses):
+        """
+        Convert Camera-to-World poses from Unity to Open3D space in one batch.
+        
+        Args:
+            unity_camera_poses: (N, 4, 4) Camera-to-World matrices (Unity space)
+            
+        Returns:
+            (N, 4, 4) Camera-to-World matrices (Open3D space)
+        """
+        from scipy.spatial.transform import Rotation as R
+        
+        if len(unity_camera_poses) == 0:
+            return np.zeros((0, 4, 4))
+        
+        unity_transform = Transforms(
+            coordinate_system=CoordinateSystem.UNITY,
+            positions=unity_camera_poses[:, :3, 3],
+            rotations=R.from_matrix(unity_camera_poses[:, :3, :3]).as_quat() # [x, y, z, w]
+        )
+        open3d_transform = unity_transform.convert_coordinate_system(
+            CoordinateSystem.OPEN3D, 
+            is_camera=True # <--- CRITICAL FIX: Treat as camera to apply correct Basis change
+        )
+        return open3d_transform.extrinsics_cw
+
     def run_reconstruction(
         self, 
         on_progress=None, 
@@ -217,6 +284,23 @@ class QuestReconstructionPipeline:
         processing_frames = frames_subset[::frame_interval]
         total_processing = len(processing_frames)
         
+        # Static per-scan data: parse all head poses once instead of per frame
+        head_poses = self._parse_head_poses(processing_frames)
+        
+        # T_cam_world = T_head_world @ T_cam_head, converted to Open3D space for all frames at once
+        camera_poses_open3d = {
+            cam: self._to_open3d_camera_poses(head_poses @ extrinsics_map_unity[cam])
+            for cam in cameras_to_process
+        }
+        
+        # Size the TSDF hash map for this trajectory before anything is integrated;
+        # depth beyond 5 m is dropped below, so it bounds the observable region
+        if self.config.get("reconstruction.auto_block_count", True):
+            camera_positions = np.concatenate([poses[:, :3, 3] for poses in camera_poses_open3d.values()])
+            block_count = self.reconstructor.estimate_block_count(camera_positions, depth_range=5.0)
+            self.reconstructor.set_block_count(block_count)
+            if on_log: on_log(f"TSDF block count: {self.reconstructor.block_count}")
+        
         # --- DRIFT CORRECTION PRE-PASS ---
         optimized_poses_map = {}
         if self.config.get("reconstruction.enable_drift_correction", False):
@@ -230,12 +314,20 @@ class QuestReconstructionPipeline:
                 # Sample keyframes for optimization (e.g. every 3rd processed frame)
                 opt_stride = max(1, total_processing // 20) 
                 
-                for idx in range(0, total_processing, opt_stride):
+                def load_keyframe(idx):
                     frame = processing_frames[idx]
                     p_dir = frame.get('_project_dir', self.project_dirs[0])
-                    rgb, depth, depth_info = QuestImageProcessor.process_quest_frame(
-                        str(p_dir), frame, camera='left'
+                    # Only depth is used here, skip the colour conversion
+                    return QuestImageProcessor.process_quest_frame(
+                        str(p_dir), frame, camera='left', color_mode='gray'
                     )
+                
+                # Keyframes are independent: decode them on all cores, register in order
+                keyframe_indices = range(0, total_processing, opt_stride)
+                with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as pool:
+                    keyframes = list(pool.map(load_keyframe, keyframe_indices))
+                
+                for idx, (rgb, depth, depth_info) in zip(keyframe_indices, keyframes):
                     if depth is None: continue
                     
                     depth_linear = convert_depth_to_linear(depth, 
@@ -245,17 +337,8 @@ class QuestReconstructionPipeline:
                     # (Quick and dirty conversion for registration)
                     intrinsics = self.get_camera_intrinsics('left', depth_info)
                     
-                    # Compute initial pose
-                    head_pos = np.array(frame['pose']['position'])
-                    head_rot = np.array(frame['pose']['rotation'])
-                    from scipy.spatial.transform import Rotation as R
-                    head_T = np.eye(4); head_T[:3,:3] = R.from_quat(head_rot).as_matrix(); head_T[:3,3] = head_pos
-                    unity_camera_pose = head_T @ extrinsics_map_unity[camera if camera != 'both' else 'left']
-                    cam_pos_unity = unity_camera_pose[:3, 3]
-                    cam_rot_unity = R.from_matrix(unity_camera_pose[:3, :3]).as_quat()
-                    unity_transform = Transforms(CoordinateSystem.UNITY, np.array([cam_pos_unity]), np.array([cam_rot_unity]))
-                    open3d_transform = unity_transform.convert_coordinate_system(CoordinateSystem.OPEN3D, is_camera=True)
-                    init_pose = open3d_transform.extrinsics_cw[0]
+                    # Initial pose
+                    init_pose = camera_poses_open3d[camera if camera != 'both' else 'left'][idx]
 
                     # Create PCD
                     depth_img_o3d = o3d.geometry.Image((depth_linear * 1000).astype(np.uint16))
@@ -285,203 +368,225 @@ class QuestReconstructionPipeline:
                 import traceback
                 print(traceback.format_exc())
 
+        # 'gray' integrates luminance only and skips YUV->RGB / BGR->RGB conversion
+        color_mode = self.config.get("reconstruction.color_mode", "rgb")
+        
+        # Double-buffered frame loading: decode/IO for upcoming frames runs on worker
+        # threads while Open3D integrates the current one (it releases the GIL)
+        # One directory listing per capture instead of several stat() calls per frame
+        frames_by_dir = {}
+        for frame in processing_frames:
+            frames_by_dir.setdefault(str(frame.get('_project_dir', self.project_dirs[0])), []).append(frame)
+        file_indexes = {
+            p_dir: QuestImageProcessor.build_file_index(p_dir, frames)
+            for p_dir, frames in frames_by_dir.items()
+        }
+        
+        def load_frame_set(frame):
+            p_dir = str(frame.get('_project_dir', self.project_dirs[0]))
+            return {
+                # FIX 1: Map 'color' option to 'left' camera (Quest RGB is left camera)
+                cam: QuestImageProcessor.process_quest_frame(
+                    p_dir, frame, camera='left' if cam == 'color' else cam, color_mode=color_mode,
+                    file_index=file_indexes[p_dir]
+                )
+                for cam in cameras_to_process
+            }
+        
+        prefetch_depth = max(1, int(self.config.get("reconstruction.prefetch_frames", 3)))
+        loader = ThreadPoolExecutor(max_workers=prefetch_depth)
+        pending_frames = deque(loader.submit(load_frame_set, f) for f in processing_frames[:prefetch_depth])
+        
+        # Config is fixed for the run: read it once instead of per frame
+        enable_inpainting = bool(self.config.get("reconstruction.enable_inpainting", False))
+        bilateral_depth = bool(self.config.get("reconstruction.bilateral_depth", False))
+        
+        # Skipped frames are summarized once at the end instead of logged per frame
+        skipped_intrinsics = []
+        skipped_poses = []
+        last_pct = -1
+        # Linear depth only lives until integrate_frame copies it to the device,
+        # so one buffer per depth resolution is reused for the whole run
+        depth_linear_buffers = {}
         preview_rgb = None
-        for i, frame in enumerate(processing_frames):
-            if is_cancelled and is_cancelled():
-                if on_log: on_log("Reconstruction CANCELLED by user.")
-                return None
-                
-            current_real_index = start_frame + i * frame_interval
-            
-            if on_progress: on_progress(int((i + 1) / total_processing * 100))
-            if on_log and i % max(1, total_processing // 20) == 0:
-                on_log(f"Processing frame set {i+1}/{total_processing}...")
+        # Queued prefetches must not outlive the loop, whether it finishes, is cancelled or raises
+        try:
+            for i, frame in enumerate(processing_frames):
+                if is_cancelled and is_cancelled():
+                    if on_log: on_log("Reconstruction CANCELLED by user.")
+                    return None
             
-            # Get Head Pose (Unity World)
-            # frame['pose']['position'] -> [x, y, z]
-            # frame['pose']['rotation'] -> [x, y, z, w] ideally
-            head_pos = np.array(frame['pose']['position'])
-            head_rot = np.array(frame['pose']['rotation'])
+                frame_set = pending_frames.popleft().result()
+                if i + prefetch_depth < total_processing:
+                    pending_frames.append(loader.submit(load_frame_set, processing_frames[i + prefetch_depth]))
+                
+                current_real_index = start_frame + i * frame_interval
             
-            # Construct Head Matrix (Unity)
-            from scipy.spatial.transform import Rotation as R
-            head_R = R.from_quat(head_rot).as_matrix()
-            head_T = np.eye(4)
-            head_T[:3, :3] = head_R
-            head_T[:3, 3] = head_pos
+                pct = int((i + 1) / total_processing * 100)
+                if on_progress and pct != last_pct:
+                    on_progress(pct)
+                    last_pct = pct
+                if on_log and i % max(1, total_processing // 20) == 0:
+                    on_log(f"Processing frame set {i+1}/{total_processing}...")
             
-            preview_rgb = None
-            for cam in cameras_to_process:
-                try:
-                    # FIX 1: Map 'color' option to 'left' camera (Quest RGB is left camera)
-                    actual_cam = 'left' if cam == 'color' else cam
-                    p_dir = frame.get('_project_dir', self.project_dirs[0])
-                    
-                    rgb, depth, depth_info = QuestImageProcessor.process_quest_frame(
-                        str(p_dir),
-                        frame,
-                        camera=actual_cam
-                    )
+                preview_rgb = None
+                for cam in cameras_to_process:
+                    try:
+                        actual_cam = 'left' if cam == 'color' else cam
+                        rgb, depth, depth_info = frame_set[cam]
                     
-                    if rgb is None or depth is None:
-                        failed_count += 1
-                        continue
+                        if rgb is None or depth is None:
+                            failed_count += 1
+                            continue
                      
-                    # Save for GUI preview (prefer 'left' or first available)
-                    if preview_rgb is None or actual_cam == 'left':
-                        preview_rgb = rgb
+                        # Save for GUI preview (prefer 'left' or first available)
+                        if preview_rgb is None or actual_cam == 'left':
+                            preview_rgb = rgb
 
-                    # 1. Get accurate intrinsics
-                    intrinsics = self.get_camera_intrinsics(cam, depth_info, debug=(i < 5))
-                    
-                    # DEBUG: Check raw depth BEFORE linearization
-                    if i < 5:
-                        raw_valid = depth[depth > 0]
-                        if len(raw_valid) > 0:
-                            msg = f"  RAW Depth: min={np.min(raw_valid):.4f}, max={np.max(raw_valid):.4f}, mean={np.mean(raw_valid):.4f}, pixels={len(raw_valid)}"
-                            print(msg)
-                            if on_log: on_log(msg)
-                        else:
-                            msg = "  RAW Depth: NO VALID PIXELS (all zeros!)"
-                            print(msg)
-                            if on_log: on_log(msg)
+                        # 1. Get accurate intrinsics
+                        intrinsics = self.get_camera_intrinsics(cam, depth_info, debug=(i < 5))
                     
-                    # 2. Linearize depth
-                    if depth_info:
-                        near = depth_info.get('near_z', 0.1)
-                        far = depth_info.get('far_z', 3.0)
-                        
-                        # DEBUG: Log linearization parameters
+                        # DEBUG: Check raw depth BEFORE linearization
                         if i < 5:
-                            msg = f"  Linearizing depth: near={near:.2f}, far={far:.2f}"
-                            print(msg)
-                            if on_log: on_log(msg)
+                            raw_valid = depth[depth > 0]
+                            if len(raw_valid) > 0:
+                                msg = f"  RAW Depth: min={np.min(raw_valid):.4f}, max={np.max(raw_valid):.4f}, mean={np.mean(raw_valid):.4f}, pixels={len(raw_valid)}"
+                                logger.debug(msg)
+                                if on_log: on_log(msg)
+                            else:
+                                msg = "  RAW Depth: NO VALID PIXELS (all zeros!)"
+                                logger.debug(msg)
+                                if on_log: on_log(msg)
+                    
+                        # 2. Linearize depth
+                        depth_out = depth_linear_buffers.get(depth.shape)
+                        if depth_out is None:
+                            depth_out = depth_linear_buffers[depth.shape] = np.empty(depth.shape, dtype=np.float32)
+                    
+                        if depth_info:
+                            near = depth_info.get('near_z', 0.1)
+                            far = depth_info.get('far_z', 3.0)
                         
-                        depth_linear = convert_depth_to_linear(depth, near, far)
-                    else:
-                        # New format: depth is NDC [0,1], need to linearize
-                        depth_max = np.max(depth)
-                        if depth_max <= 1.0 and depth_max > 0:
-                            # NDC depth from Quest Environment Depth API
-                            near = 0.1
-                            far = 20.0
+                            # DEBUG: Log linearization parameters
                             if i < 5:
-                                msg = f"  Auto-detected NDC depth (max={depth_max:.3f}), linearizing: near={near}, far={far}"
-                                print(msg)
+                                msg = f"  Linearizing depth: near={near:.2f}, far={far:.2f}"
+                                logger.debug(msg)
                                 if on_log: on_log(msg)
-                            depth_linear = convert_depth_to_linear(depth, near, far)
+                        
+                            depth_linear = convert_depth_to_linear(depth, near, far, min_depth=0.1, max_depth=5.0, out=depth_out)
                         else:
-                            # Legacy: assume depth is already in meters
-                            depth_linear = depth
+                            # New format: depth is NDC [0,1], need to linearize
+                            depth_max = np.max(depth)
+                            if depth_max <= 1.0 and depth_max > 0:
+                                # NDC depth from Quest Environment Depth API
+                                near = 0.1
+                                far = 20.0
+                                if i < 5:
+                                    msg = f"  Auto-detected NDC depth (max={depth_max:.3f}), linearizing: near={near}, far={far}"
+                                    logger.debug(msg)
+                                    if on_log: on_log(msg)
+                                depth_linear = convert_depth_to_linear(depth, near, far, min_depth=0.1, max_depth=5.0, out=depth_out)
+                            else:
+                                # Legacy: assume depth is already in meters
+                                depth_linear = depth
+                                depth_linear[depth_linear < 0.1] = 0.0
+                                depth_linear[depth_linear > 5.0] = 0.0
                     
-                    # FIX 2a: Filter depth range to remove outliers
-                    # Adjusted range based on actual data: 0.1m - 5.0m (was too strict at 0.2-2.5m)
-                    depth_linear[depth_linear < 0.1] = 0.0   # Too close (< 10cm) - likely noise
-                    depth_linear[depth_linear > 5.0] = 0.0   # Too far (> 5m) - removes 30+m outliers
+                        # FIX 2a: Depth range 0.1m - 5.0m is applied inside convert_depth_to_linear
+                        # (< 10cm is likely noise, > 5m removes 30+m outliers; was too strict at 0.2-2.5m)
                     
-                    # DEBUG: Log depth distribution AFTER filtering
-                    if i < 5:
-                        valid_depth = depth_linear[depth_linear > 0]
-                        if len(valid_depth) > 0:
-                            d_min, d_max, d_mean = np.min(valid_depth), np.max(valid_depth), np.mean(valid_depth)
-                            msg = f"  Depth AFTER filter: min={d_min:.2f}m, max={d_max:.2f}m, mean={d_mean:.2f}m, pixels={len(valid_depth)}"
-                            print(msg)
-                            if on_log: on_log(msg)
+                        # DEBUG: Log depth distribution AFTER filtering
+                        if i < 5:
+                            valid_depth = depth_linear[depth_linear > 0]
+                            if len(valid_depth) > 0:
+                                d_min, d_max, d_mean = np.min(valid_depth), np.max(valid_depth), np.mean(valid_depth)
+                                msg = f"  Depth AFTER filter: min={d_min:.2f}m, max={d_max:.2f}m, mean={d_mean:.2f}m, pixels={len(valid_depth)}"
+                                logger.debug(msg)
+                                if on_log: on_log(msg)
                     
-                    # FIX 2b: Bilateral filtering DISABLED (too slow, removes valid data)
-                    # Reference project doesn't use it either
+                        # FIX 2b: Bilateral filtering off by default (too slow, removes valid data)
+                        # Reference project doesn't use it either
+                        if bilateral_depth:
+                            depth_linear = filter_depth(depth_linear, bilateral=True, copy=False)
                         
-                    # 3. Compute Camera Pose in Unity World
-                    # T_cam_world = T_head_world @ T_cam_head
-                    unity_camera_pose = head_T @ extrinsics_map_unity[cam]
+                        # 3-4. Camera-to-World pose in Open3D space (precomputed from
+                        # frame['pose'] head poses and the Head-to-Camera extrinsics)
+                        final_pose_open3d = camera_poses_open3d[cam][i]
                     
-                    # 4. Convert to Open3D Coordinate System
-                    # Create Transforms object with this single pose
-                    # Extract translation and rotation from the combined matrix
-                    cam_pos_unity = unity_camera_pose[:3, 3]
-                    cam_rot_unity = R.from_matrix(unity_camera_pose[:3, :3]).as_quat()
+                        # OVERRIDE with optimized pose if available
+                        if i in optimized_poses_map:
+                            # Quest -> Open3D is a fixed basis change. 
+                            # Our refiner worked in Open3D space, so we just use the result.
+                            final_pose_open3d = optimized_poses_map[i]
+                        elif len(optimized_poses_map) > 0:
+                            # interpolation (optional) - for now just skip if not keyframe 
+                            # or better: dont overwrite if it was a frame between keyframes?
+                            # Let's simple use the raw pose but maybe that creates jumps.
+                            # Actually, most frames since stride is high will be keyframes.
+                            pass
+                        # Integation Debug Check
+                        if logger.isEnabledFor(logging.DEBUG) and (i < 20 or (i % 10 == 0)):
+                             t_min, t_max = np.min(depth_linear), np.max(depth_linear)
+                             p_trans = final_pose_open3d[:3, 3]
+                             curr_fx = intrinsics[0,0]
+                             logger.debug(f"Frame {i}: Depth[{t_min:.3f}, {t_max:.3f}] PoseT{p_trans} FX={curr_fx:.1f}")
                     
-                    unity_transform = Transforms(
-                        coordinate_system=CoordinateSystem.UNITY,
-                        positions=np.array([cam_pos_unity]),
-                        rotations=np.array([cam_rot_unity]) # [x, y, z, w]
-                    )
-                    
-                    open3d_transform = unity_transform.convert_coordinate_system(
-                        CoordinateSystem.OPEN3D, 
-                        is_camera=True # <--- CRITICAL FIX: Treat as camera to apply correct Basis change
-                    )
-                    
-                    # Get Camera-to-World matrix in Open3D space
-                    # indexing [0] because we wrapped in array
-                    final_pose_open3d = open3d_transform.extrinsics_cw[0]
-                    
-                    # OVERRIDE with optimized pose if available
-                    if i in optimized_poses_map:
-                        # Quest -> Open3D is a fixed basis change. 
-                        # Our refiner worked in Open3D space, so we just use the result.
-                        final_pose_open3d = optimized_poses_map[i]
-                    elif len(optimized_poses_map) > 0:
-                        # interpolation (optional) - for now just skip if not keyframe 
-                        # or better: dont overwrite if it was a frame between keyframes?
-                        # Let's simple use the raw pose but maybe that creates jumps.
-                        # Actually, most frames since stride is high will be keyframes.
-                        pass
-                    # Integation Debug Check
-                    if i < 20 or (i % 10 == 0):
-                         t_min, t_max = np.min(depth_linear), np.max(depth_linear)
-                         p_trans = final_pose_open3d[:3, 3]
-                         curr_fx = intrinsics[0,0]
-                         msg = f"DEBUG Frame {i}: Depth[{t_min:.3f}, {t_max:.3f}] PoseT{p_trans} FX={curr_fx:.1f}"
-                         if on_log: on_log(msg)
-                         print(msg) 
-                    
-                    # Safety Check: Skip frames where intrinsics are wildy different (e.g. uninitialized 144.4 vs expected ~800)
-                    curr_fx = intrinsics[0,0]
-                    if curr_fx < 400: 
-                        warn = f"WARNING: Skipping Frame {i} due to suspicious intrinsics (FX={curr_fx:.1f})"
-                        if on_log: on_log(warn)
-                        print(warn)
-                        continue
+                        # Safety Check: Skip frames where intrinsics are wildy different (e.g. uninitialized 144.4 vs expected ~800)
+                        curr_fx = intrinsics[0,0]
+                        if curr_fx < 400: 
+                            skipped_intrinsics.append(i)
+                            logger.debug(f"Skipping frame {i} due to suspicious intrinsics (FX={curr_fx:.1f})")
+                            continue
 
-                    if np.any(np.isnan(final_pose_open3d)) or np.any(np.isinf(final_pose_open3d)):
-                        err_msg = f"ERROR: Invalid Pose detected in frame {i}!"
-                        if on_log: on_log(err_msg)
-                        print(err_msg)
-                        continue
+                        if np.any(np.isnan(final_pose_open3d)) or np.any(np.isinf(final_pose_open3d)):
+                            skipped_poses.append(i)
+                            logger.debug(f"Invalid pose detected in frame {i}")
+                            continue
 
-                    # AI Inpainting Pre-process
-                    if self.config.get("reconstruction.enable_inpainting", False):
-                        try:
-                            if not hasattr(self, 'depth_inpainter'):
-                                self.depth_inpainter = DepthEstimator(
-                                    model_type="MiDaS_small",
-                                    backend=self.config.get("reconstruction.acceleration_backend", "auto")
-                                )
+                        # AI Inpainting Pre-process
+                        if enable_inpainting:
+                            try:
+                                if not hasattr(self, 'depth_inpainter'):
+                                    self.depth_inpainter = DepthEstimator(
+                                        model_type="MiDaS_small",
+                                        backend=self.config.get("reconstruction.acceleration_backend", "auto"),
+                                        fp16=self.config.get("reconstruction.inpainting_fp16", True),
+                                        compile_model=self.config.get("reconstruction.inpainting_compile", False),
+                                        cache_dir=(
+                                            str(self.project_dirs[0] / "Cache" / "depth")
+                                            if self.config.get("reconstruction.inpainting_disk_cache", False) else None
+                                        )
+                                    )
                             
-                            depth_linear = self.depth_inpainter.hybrid_fill(depth_linear, rgb)
-                            if i < 5: on_log(f"  AI Inpainting applied to frame {i}")
-                        except Exception as e:
-                            if i == 0: on_log(f"⚠ AI Inpainting failed: {e}")
+                                depth_linear = self.depth_inpainter.hybrid_fill(depth_linear, rgb)
+                                if i < 5: on_log(f"  AI Inpainting applied to frame {i}")
+                            except Exception as e:
+                                if i == 0: on_log(f"⚠ AI Inpainting failed: {e}")
 
-                    # Integrate
-                    self.reconstructor.integrate_frame(
-                        rgb, 
-                        depth_linear, 
-                        intrinsics, 
-                        final_pose_open3d
-                    )
-                    processed_count += 1
+                        # Integrate
+                        self.reconstructor.integrate_frame(
+                            rgb, 
+                            depth_linear, 
+                            intrinsics, 
+                            final_pose_open3d
+                        )
+                        processed_count += 1
                     
-                except Exception as e:
-                    if on_log and failed_count < 5:
-                        on_log(f"Error processing {cam} frame {i}: {str(e)}")
-                    failed_count += 1
+                    except Exception as e:
+                        if on_log and failed_count < 5:
+                            on_log(f"Error processing {cam} frame {i}: {str(e)}")
+                        failed_count += 1
             
-            # Update GUI preview with processed RGB (saves redundant disk read)
-            if on_frame:
-                on_frame(current_real_index, rgb_data=preview_rgb)
-        
+                # Update GUI preview with processed RGB (saves redundant disk read)
+                if on_frame:
+                    on_frame(current_real_index, rgb_data=preview_rgb)
+        finally:
+            loader.shutdown(wait=False, cancel_futures=True)
+
+        if on_log and skipped_intrinsics:
+            on_log(f"WARNING: Skipped {len(skipped_intrinsics)} frames due to suspicious intrinsics (first: {skipped_intrinsics[:5]})")
+        if on_log and skipped_poses:
+            on_log(f"ERROR: Invalid pose in {len(skipped_poses)} frames (first: {skipped_poses[:5]})")
         mesh = self.reconstructor.extract_mesh()
         
         # 5. Optional Advanced Texturing (UV Mapping)
@@ -496,29 +601,26 @@ class QuestReconstructionPipeline:
                 # For efficiency, we only use a subset of frames for baking if there are too many
                 bake_stride = max(1, len(processing_frames) // 30) # Use up to 30 frames for baking
                 
-                for idx in range(0, len(processing_frames), bake_stride):
+                actual_cam = camera if camera != 'both' else 'left'
+                
+                def load_bake_frame(idx):
                     frame = processing_frames[idx]
                     p_dir = frame.get('_project_dir', self.project_dirs[0])
-                    actual_cam = camera if camera != 'both' else 'left'
-                    rgb, _, depth_info = QuestImageProcessor.process_quest_frame(
+                    return QuestImageProcessor.process_quest_frame(
                         str(p_dir), frame, camera=actual_cam
                     )
-                    
+                
+                bake_indices = range(0, len(processing_frames), bake_stride)
+                with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as pool:
+                    bake_frame_sets = list(pool.map(load_bake_frame, bake_indices))
+                
+                for idx, (rgb, _, depth_info) in zip(bake_indices, bake_frame_sets):
                     if rgb is None: continue
                     
                     # Compute pose and intrinsics same as during integration
                     # (This could be refactored to avoid duplication)
                     intrinsics = self.get_camera_intrinsics(actual_cam, depth_info)
-                    head_pos = np.array(frame['pose']['position'])
-                    head_rot = np.array(frame['pose']['rotation'])
-                    from scipy.spatial.transform import Rotation as R
-                    head_T = np.eye(4); head_T[:3,:3] = R.from_quat(head_rot).as_matrix(); head_T[:3,3] = head_pos
-                    unity_camera_pose = head_T @ extrinsics_map_unity[actual_cam]
-                    cam_pos_unity = unity_camera_pose[:3, 3]
-                    cam_rot_unity = R.from_matrix(unity_camera_pose[:3, :3]).as_quat()
-                    unity_transform = Transforms(CoordinateSystem.UNITY, np.array([cam_pos_unity]), np.array([cam_rot_unity]))
-                    open3d_transform = unity_transform.convert_coordinate_system(CoordinateSystem.OPEN3D, is_camera=True)
-                    final_pose_open3d = open3d_transform.extrinsics_cw[0]
+                    final_pose_open3d = camera_poses_open3d[actual_cam][idx]
                     
                     baker_frames.append({
                         'rgb': rgb,
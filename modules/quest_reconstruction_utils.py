@@ -3,6 +3,12 @@ from enum import Enum
 from dataclasses import dataclass
 from scipy.spatial.transform import Rotation as R
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 class CoordinateSystem(Enum):
     """
     Enum representing different coordinate systems.
@@ -132,17 +138,58 @@ def to_linear_depth(d, x, y):
     denom = ndc + y
     return np.divide(x, denom, out=np.zeros_like(d), where=denom != 0)
 
-def convert_depth_to_linear(depth_buffer: np.ndarray, near: float, far: float):
-    """Convert raw non-linear depth buffer to linear depth in meters."""
+if HAS_NUMBA:
+    # fastmath without 'nnan'/'ninf' so the NaN/Inf sanitizing below is not optimized away
+    @njit(parallel=True, cache=True, fastmath={"nsz", "arcp", "contract", "afn", "reassoc"})
+    def _linear_depth_kernel(depth, x, y, min_depth, max_depth, out):
+        for i in prange(depth.size):
+            d = depth[i]
+            if d != d or d < 0.0:
+                d = 0.0
+            elif d > 1.0:
+                d = 1.0
+            denom = d * 2.0 - 1.0 + y
+            z = x / denom if denom != 0.0 else 0.0
+            if not np.isfinite(z) or z < min_depth or z > max_depth:
+                z = 0.0
+            out[i] = z
+
+def convert_depth_to_linear(depth_buffer: np.ndarray, near: float, far: float,
+                            min_depth=None, max_depth=None, out=None):
+    """
+    Convert raw non-linear depth buffer to linear depth in meters.
+    Values outside [min_depth, max_depth] are zeroed. With numba available the
+    sanitize/linearize/clamp steps run as one parallel pass with no temporaries.
+    """
+    x, y = compute_ndc_to_linear_depth_params(near, far)
+    
+    if HAS_NUMBA:
+        depth = np.ascontiguousarray(depth_buffer, dtype=np.float32)
+        if out is None:
+            out = np.empty(depth.shape, dtype=np.float32)
+        _linear_depth_kernel(
+            depth.reshape(-1), x, y,
+            0.0 if min_depth is None else float(min_depth),
+            np.inf if max_depth is None else float(max_depth),
+            out.reshape(-1)
+        )
+        return out
+    
     # Sanitize input buffer
     depth_clamped = np.clip(np.nan_to_num(depth_buffer, nan=0.0, posinf=1.0, neginf=0.0), 0.0, 1.0)
     
-    x, y = compute_ndc_to_linear_depth_params(near, far)
     depth_array = to_linear_depth(depth_clamped, x, y)
     
     # Sanitize output
     # Filter out potential negative depths or huge values that might result from division by near-zero
     depth_array = np.nan_to_num(depth_array, nan=0.0, posinf=0.0, neginf=0.0)
     depth_array[depth_array < 0] = 0.0
+    if min_depth is not None:
+        depth_array[depth_array < min_depth] = 0.0
+    if max_depth is not None:
+        depth_array[depth_array > max_depth] = 0.0
     
+    if out is not None:
+        np.copyto(out, depth_array, casting="unsafe")
+        return out
     return depth_array.astype(np.float32)
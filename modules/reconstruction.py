@@ -55,28 +55,73 @@ class QuestReconstructor:
                 print(f"QuestReconstructor: Error checking CUDA, using CPU. ({e})")
 
             # Initialize VoxelBlockGrid
-            self.vbg = o3d.t.geometry.VoxelBlockGrid(
-                attr_names=('tsdf', 'weight', 'color'),
-                attr_dtypes=(o3c.float32, o3c.float32, o3c.float32),
-                attr_channels=((1), (1), (3)),
-                voxel_size=self.voxel_size,
-                block_resolution=self.block_resolution,
-                block_count=self.block_count,
-                device=self.device
-            )
-            # Alias for older tests/code
-            self.volume = self.vbg
+            self._create_grid()
         else:
             self.vbg = None
             self.volume = None
 
+    def _create_grid(self):
+        self.vbg = o3d.t.geometry.VoxelBlockGrid(
+            attr_names=('tsdf', 'weight', 'color'),
+            attr_dtypes=(o3c.float32, o3c.float32, o3c.float32),
+            attr_channels=((1), (1), (3)),
+            voxel_size=self.voxel_size,
+            block_resolution=self.block_resolution,
+            block_count=self.block_count,
+            device=self.device
+        )
+        # Alias for older tests/code
+        self.volume = self.vbg
+
+    def estimate_block_count(self, camera_positions, depth_range=None, min_blocks=16384, max_blocks=None):
+        """
+        Estimate how many voxel blocks a scan will touch from its camera trajectory.
+        Observed surfaces are assumed to lie on the shell of the trajectory bounding box
+        grown by the usable depth range, two blocks thick (truncation band), with 50% headroom.
+        
+        Args:
+            camera_positions: (N, 3) camera centers in world space
+            depth_range: Farthest depth the caller integrates (defaults to depth_max)
+            min_blocks, max_blocks: Clamp range; max_blocks defaults to the configured
+                block_count, so the estimate only ever lowers the up-front allocation
+            
+        Returns:
+            Estimated block count
+        """
+        if max_blocks is None:
+            max_blocks = self.block_count
+        positions = np.asarray(camera_positions, dtype=np.float64).reshape(-1, 3)
+        if len(positions) == 0:
+            return max_blocks
+        
+        reach = self.depth_max if depth_range is None else min(self.depth_max, depth_range)
+        extent = np.ptp(positions, axis=0) + 2.0 * reach
+        shell_area = 2.0 * (extent[0] * extent[1] + extent[1] * extent[2] + extent[0] * extent[2])
+        block_size = self.voxel_size * self.block_resolution
+        estimate = int(shell_area / block_size ** 2 * 2 * 1.5)
+        return int(min(max(estimate, min_blocks), max_blocks))
+
+    def set_block_count(self, block_count):
+        """
+        Re-size the hash map before integration starts (every block is preallocated,
+        roughly 80 KB each at 16^3 float voxels). Ignored once the grid holds data.
+        """
+        block_count = int(block_count)
+        if block_count == self.block_count:
+            return
+        if self.vbg is not None and self.vbg.hashmap().size() > 0:
+            return
+        self.block_count = block_count
+        if self.vbg is not None:
+            self._create_grid()
+
     def integrate_frame(self, rgb_image, depth_image, intrinsics, pose):
         """
         Integrate a single RGBD frame into the volume.
         
         Args:
             rgb_image: (H, W, 3) numpy array (uint8)
-            depth_image: (H, W) numpy array (float32 meters)
+            depth_image: (H, W) numpy array (float32 meters, or uint16 millimeters)
             intrinsics: (3, 3) numpy array
             pose: (4, 4) numpy array (Camera to World)
         """
@@ -88,8 +133,14 @@ class QuestReconstructor:
             print("[QuestReconstructor] WARNING: Depth image is None, skipping frame")
             return
         
+        # uint16 depth stays in millimeters end to end (half the bytes of float32);
+        # Open3D rescales it with depth_scale on the device
+        depth_scale = 1000.0 if depth_image.dtype == np.uint16 else 1.0
+        
         # Check if depth has any valid (non-zero, non-nan, non-inf) values
-        valid_depth_mask = np.isfinite(depth_image) & (depth_image > 0) & (depth_image < self.depth_max)
+        valid_depth_mask = (depth_image > 0) & (depth_image < self.depth_max * depth_scale)
+        if depth_scale == 1.0:
+            valid_depth_mask &= np.isfinite(depth_image)
         num_valid_pixels = np.sum(valid_depth_mask)
         
         if num_valid_pixels == 0:
@@ -100,7 +151,7 @@ class QuestReconstructor:
         # This happens when Quest Environment Depth API fails to capture actual depth
         unique_values = np.unique(depth_image[valid_depth_mask])
         if len(unique_values) == 1:
-            print(f"[QuestReconstructor] WARNING: All depth pixels are identical ({unique_values[0]:.3f}m), skipping frame")
+            print(f"[QuestReconstructor] WARNING: All depth pixels are identical ({unique_values[0] / depth_scale:.3f}m), skipping frame")
             print("                      → Quest Depth API returned placeholder data (likely poor lighting/texture)")
             return
         
@@ -112,11 +163,19 @@ class QuestReconstructor:
 
         
         depth_tensor = o3d.t.geometry.Image(
-            o3c.Tensor(depth_image.astype(np.float32), device=self.device)
+            o3c.Tensor(
+                np.ascontiguousarray(depth_image, dtype=np.uint16 if depth_scale != 1.0 else np.float32),
+                device=self.device
+            )
         )
         
+        # Luminance-only frames (color_mode 'gray') fill all three colour channels
+        if rgb_image.ndim == 2:
+            rgb_image = np.repeat(rgb_image[..., None], 3, axis=2)
+        
+        # Upload colour as uint8 (1/4 of the float32 bytes) and normalize on the device
         color_tensor = o3d.t.geometry.Image(
-            o3c.Tensor(rgb_image.astype(np.float32) / 255.0, device=self.device)
+            o3c.Tensor(np.ascontiguousarray(rgb_image, dtype=np.uint8), device=self.device).to(o3c.float32) / 255.0
         )
 
         # Intrinsics
@@ -127,112 +186,54 @@ class QuestReconstructor:
         extrinsic_tensor = o3c.Tensor(extrinsic.astype(np.float64), device=self.device)
 
         # ScalableTSDFVolume parameters
-        depth_scale = 1.0  # Input is already in meters
         depth_max = self.depth_max
         trunc_voxel_multiplier = self.trunc_voxel_multiplier
         
-        # Get active blocks (frustum culling)
-        # For Open3D 0.16+, VoxelBlockGrid has a direct integrate function 
-        # that handles block allocation internally if we use the right overload.
-        
-        # However, looking at standard examples, we often see:
-        # frustum_block_coords = vbg.hashmap().active_buf_indices()
-        
-        # Let's try the direct integration without manual block computation first, 
-        # as modern Open3D Tensor API usually supports it.
-        
-        # If that fails, we might need to use the specific low-level API.
-        # The error was 'AttributeError: 'open3d.cpu.pybind.core.HashMap' object has no attribute 'compute_active_block_indices'
-        
-        # Let's check available methods on vbg object in a separate script if possible, 
-        # but for now let's try the most common pattern:
-        
-        # vbg.integrate(depth, color, intrinsic, extrinsic, depth_scale, depth_max)
-        # This assumes the high-level API exists.
-        
-        # Get active blocks (frustum culling)
-        # Fix for Open3D 0.18+ API
-        
-        # Create frustum block coordinates from depth
-        # We need to use the method on the VoxelBlockGrid object or utility
-        
-        # Get active blocks (frustum culling)
-        # Low-level implementation since high-level helpers are missing in 0.19
-        
-        # 1. Provide Depth Image to simple PointCloud
-        # We need to compute which blocks are touched by the depth map.
-        # This is usually done by "projecting" the depth map to 3D and finding unique block coords.
+        # Blocks touched by this frame (frustum culling); integrate() activates them
+        block_coords = self._frustum_block_coords(
+            depth_tensor, intrinsics_tensor, extrinsic_tensor, depth_scale, depth_max
+        )
         
-        # Create a point cloud from depth
-        pcd = o3d.t.geometry.PointCloud.create_from_depth_image(
+        self.vbg.integrate(
+            block_coords,
             depth_tensor,
+            color_tensor,
+            intrinsics_tensor,
             intrinsics_tensor,
             extrinsic_tensor,
             depth_scale,
             depth_max,
-            stride=4  # Downsample for speed in block allocation
+            trunc_voxel_multiplier
         )
+
+    def _frustum_block_coords(self, depth_tensor, intrinsics_tensor, extrinsic_tensor, depth_scale, depth_max):
+        """
+        Unique block coordinates covering a depth frame and its truncation band.
+        Uses Open3D's on-device kernel when the binding is available; otherwise
+        falls back to back-projecting a strided point cloud.
+        """
+        if hasattr(self.vbg, "compute_unique_block_coordinates"):
+            return self.vbg.compute_unique_block_coordinates(
+                depth_tensor,
+                intrinsics_tensor,
+                extrinsic_tensor,
+                depth_scale,
+                depth_max,
+                self.trunc_voxel_multiplier
+            )
         
-        # Get coordinates
-        points = pcd.point.positions
-        
-        # Compute block coordinates: floor(point / (voxel_size * block_resolution))
-        # block_size = voxel_size * block_resolution
-        block_size = self.voxel_size * self.block_resolution
-        block_coords = (points / block_size).floor().to(o3c.int32)
-        
-        # Activate blocks in hashmap
-        # This returns the indices of activated blocks and handles uniqueness internally usually
-        # hashmap.activate(keys)
-        # Note: activate might return a tuple or just buffers.
-        # We need to get the unique keys to pass to integrate?
-        # Actually, integrate takes 'frustum_block_coords' which are the *keys* (block indices), 
-        # or 'block_indices' which are indices into the value tensor?
-        # The argument name in signatures is usually 'block_coords'.
-        
-        hashmap = self.vbg.hashmap()
-        
-        # Unique block coords
-        # unique_block_coords, _ = block_coords.unique(return_counts=False) # Tensor API doesn't have unique?
-        # Hashmap `activate` handles uniqueness.
-        
-        buf_indices, masks = hashmap.activate(block_coords)
-        
-        # We need to identify which blocks are active for integration.
-        # integrate expects 'block_coords' (Nx3 int32).
-        # We can pass the unique block coords we just calculated/activated.
-        
-        # To get unique keys accurately:
-        # 1. activation adds them.
-        # 2. we can assume all 'buf_indices' returned are the ones we want? No, that's element-wise.
-        
-        # Let's try to just collect unique keys from the points.
-        # Open3D Tensor API generic unique:
-        # Not easily available.
-        # However, checking Open3D examples for 0.18/0.19:
-        # They usually use `compute_unique_block_coordinates` which I verified is MISSING in 0.19 Python API (or I missed it).
-        # Wait, I missed checking `dir(vbg)` output carefully in previous step? 
-        # Output was: ['__class__', ..., 'attribute', 'block_count', ..., 'integrate', ..., 'save', 'size', 'to', 'value_tensor', 'value_tensors']
-        # 'compute_unique_block_coordinates' was NOT in `dir(vbg)`.
-        
-        # Workaround:
-        # If we can't easily get unique active blocks, we might be stuck.
-        # But `integrate` documentation says it needs `block_coords`.
-        # Maybe we can pass *all* block coords from the point cloud? It might be slow but correct?
-        # Or maybe `integrate` handles duplicates? 
-        
-        # Let's simple try to pass all block_coords from the stride=4 point cloud.
-        
-        self.vbg.integrate(
-            block_coords,
+        # Fallback: block coordinates of every back-projected point (duplicates
+        # are resolved by the hashmap)
+        pcd = o3d.t.geometry.PointCloud.create_from_depth_image(
             depth_tensor,
-            color_tensor,
-            intrinsics_tensor,
             intrinsics_tensor,
             extrinsic_tensor,
             depth_scale,
-            depth_max
+            depth_max,
+            stride=4  # Downsample for speed in block allocation
         )
+        block_size = self.voxel_size * self.block_resolution
+        return (pcd.point.positions / block_size).floor().to(o3c.int32)
 
     def extract_mesh(self):
         """
@@ -0,0 +1,43 @@
+import sys
+import os
+import unittest
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from modules import quest_reconstruction_utils as utils
+
+class TestDepthUtils(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.depth = rng.random((32, 32)).astype(np.float32)
+        self.depth[0, :5] = [np.nan, np.inf, -np.inf, -1.0, 2.0]
+        self.has_numba = utils.HAS_NUMBA
+
+    def tearDown(self):
+        utils.HAS_NUMBA = self.has_numba
+
+    def reference(self, near, far, min_depth, max_depth):
+        d = np.clip(np.nan_to_num(self.depth, nan=0.0, posinf=1.0, neginf=0.0), 0.0, 1.0).astype(np.float64)
+        x, y = utils.compute_ndc_to_linear_depth_params(near, far)
+        with np.errstate(divide='ignore'):
+            z = x / (d * 2.0 - 1.0 + y)
+        z[~np.isfinite(z) | (z < min_depth) | (z > max_depth)] = 0.0
+        return z
+
+    def test_linearize_and_clamp(self):
+        expected = self.reference(0.1, 20.0, 0.1, 5.0)
+        for use_numba in {False, self.has_numba}:
+            utils.HAS_NUMBA = use_numba
+            out = utils.convert_depth_to_linear(self.depth, 0.1, 20.0, min_depth=0.1, max_depth=5.0)
+            self.assertEqual(out.dtype, np.float32)
+            self.assertTrue(np.isfinite(out).all())
+            np.testing.assert_allclose(out, expected, rtol=1e-4, atol=1e-4)
+
+    def test_out_buffer_is_reused(self):
+        out = np.empty_like(self.depth)
+        result = utils.convert_depth_to_linear(self.depth, 0.1, 3.0, out=out)
+        self.assertIs(result, out)
+        self.assertTrue((out >= 0).all())
+
+if __name__ == '__main__':
+    unittest.main()
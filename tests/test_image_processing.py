@@ -0,0 +1,106 @@
+import sys
+import os
+import unittest
+from unittest import mock
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from modules import image_processing
+from modules.image_processing import yuv_to_rgb, filter_depth, apply_intrinsics
+
+class TestImageProcessing(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.w, self.h = 8, 6
+        self.y = rng.integers(0, 256, (self.h, self.w), dtype=np.uint8)
+        self.u = rng.integers(0, 256, (self.h // 2, self.w // 2), dtype=np.uint8)
+        self.v = rng.integers(0, 256, (self.h // 2, self.w // 2), dtype=np.uint8)
+
+    def reference_rgb(self):
+        # The original Quest conversion: bilinear chroma upsampling + COLOR_YUV2RGB
+        cv2 = image_processing._ensure_cv2()
+        if cv2 is None:
+            self.skipTest("OpenCV not installed")
+        size = (self.w, self.h)
+        u = cv2.resize(self.u, size, interpolation=cv2.INTER_LINEAR)
+        v = cv2.resize(self.v, size, interpolation=cv2.INTER_LINEAR)
+        return cv2.cvtColor(np.stack([self.y, u, v], axis=-1), cv2.COLOR_YUV2RGB)
+
+    def test_i420_matches_reference(self):
+        buf = np.concatenate([self.y.ravel(), self.u.ravel(), self.v.ravel()])
+        rgb = yuv_to_rgb(buf, self.w, self.h, layout="i420")
+        self.assertEqual(rgb.shape, (self.h, self.w, 3))
+        self.assertEqual(rgb.dtype, np.uint8)
+        np.testing.assert_array_equal(rgb, self.reference_rgb())
+
+    def test_nv12_matches_reference(self):
+        uv = np.stack([self.u, self.v], axis=-1).ravel()
+        buf = np.concatenate([self.y.ravel(), uv]).reshape(self.h * 3 // 2, self.w)
+        rgb = yuv_to_rgb(buf, layout="nv12")
+        np.testing.assert_array_equal(rgb, self.reference_rgb())
+
+    def test_fallbacks_match_reference(self):
+        buf = np.concatenate([self.y.ravel(), self.u.ravel(), self.v.ravel()])
+        uv = np.stack([self.u, self.v], axis=-1).ravel()
+        nv12 = np.concatenate([self.y.ravel(), uv])
+        expected = self.reference_rgb()
+        with mock.patch.object(image_processing, "_ensure_cv2", return_value=None):
+            for data, layout in ((buf, "i420"), (nv12, "nv12")):
+                rgb = yuv_to_rgb(data, self.w, self.h, layout=layout)
+                self.assertEqual(rgb.dtype, np.uint8)
+                np.testing.assert_array_equal(rgb, expected)
+
+    def test_known_colours(self):
+        # Flat planes pin the conversion coefficients independently of chroma interpolation
+        cases = {
+            (128, 128, 128): (128, 128, 128),
+            (128, 100, 200): (210, 97, 71),
+            (16, 128, 128): (16, 16, 16),
+            (200, 60, 90): (157, 249, 62),
+        }
+        for without_cv2 in (False, True):
+            with mock.patch.object(image_processing, "_ensure_cv2",
+                                   return_value=None if without_cv2 else image_processing._ensure_cv2()):
+                for (y, u, v), expected in cases.items():
+                    buf = np.concatenate([
+                        np.full(self.h * self.w, y), np.full(self.u.size, u), np.full(self.v.size, v),
+                    ]).astype(np.uint8)
+                    rgb = yuv_to_rgb(buf, self.w, self.h)
+                    np.testing.assert_array_equal(rgb, np.broadcast_to(expected, rgb.shape))
+
+    def test_neutral_chroma_is_gray(self):
+        neutral = np.full(self.u.size * 2, 128, dtype=np.uint8)
+        out = np.empty((self.h, self.w, 3), dtype=np.uint8)
+        rgb = yuv_to_rgb(np.concatenate([self.y.ravel(), neutral]), self.w, self.h, out=out)
+        self.assertIs(rgb, out)
+        for ch in range(3):
+            np.testing.assert_array_equal(rgb[..., ch], self.y)
+
+    def test_filter_depth_masks_invalid_samples(self):
+        depth = np.array([[np.nan, 0.5, 7.0], [np.inf, -1.0, 2.0]], dtype=np.float32)
+        filtered = filter_depth(depth, max_depth=5.0)
+        np.testing.assert_array_equal(filtered, [[0, 0.5, 0], [0, 0, 2.0]])
+        self.assertTrue(np.isnan(depth[0, 0]))  # input untouched
+        self.assertIs(filter_depth(depth, max_depth=5.0, copy=False), depth)
+        self.assertEqual(depth[0, 0], 0.0)
+
+    def test_filter_depth_keeps_uint16(self):
+        depth = np.array([[0, 500, 7000], [1200, 3000, 65535]], dtype=np.uint16)
+        filtered = filter_depth(depth, max_depth=5000)
+        self.assertEqual(filtered.dtype, np.uint16)
+        np.testing.assert_array_equal(filtered, [[0, 500, 0], [1200, 3000, 0]])
+
+    def test_apply_intrinsics_matches_undistort(self):
+        cv2 = image_processing._ensure_cv2()
+        if cv2 is None:
+            self.skipTest("OpenCV not installed")
+        img = np.random.default_rng(1).integers(0, 256, (48, 64, 3), dtype=np.uint8)
+        K = np.array([[50.0, 0, 32], [0, 50.0, 24], [0, 0, 1]])
+        D = np.array([0.1, -0.05, 0, 0, 0])
+        new_k, _ = cv2.getOptimalNewCameraMatrix(K, D, (64, 48), 1, (64, 48))
+        expected = cv2.undistort(img, K, D, None, new_k)
+        np.testing.assert_array_equal(apply_intrinsics(img, K, D), expected)
+        np.testing.assert_array_equal(apply_intrinsics(img, K, D), expected)  # cached maps
+
+if __name__ == '__main__':
+    unittest.main()
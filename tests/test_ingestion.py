@@ -6,7 +6,7 @@ import shutil
 
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from modules.ingestion import ZipValidator
+from modules.ingestion import ZipValidator, AsyncExtractor
 
 class TestIngestion(unittest.TestCase):
     def setUp(self):
@@ -36,9 +36,50 @@ class TestIngestion(unittest.TestCase):
         valid, msg = ZipValidator.validate(self.valid_zip)
         self.assertTrue(valid, f"Valid zip failed: {msg}")
 
+        valid, msg = ZipValidator.validate(self.valid_zip, deep=True)
+        self.assertTrue(valid, f"Valid zip failed deep check: {msg}")
+
         valid, msg = ZipValidator.validate(self.invalid_zip)
         self.assertFalse(valid, "Invalid zip passed")
         self.assertIn("ZIP does not appear to contain Quest capture data", msg)
 
+    def test_async_extraction_stored_and_deflated(self):
+        mixed_zip = os.path.join(self.test_dir, "mixed.zip")
+        payload = os.urandom(200000)
+        with zipfile.ZipFile(mixed_zip, 'w') as zf:
+            zf.writestr("frames.json", "{}", compress_type=zipfile.ZIP_DEFLATED)
+            zf.writestr("raw_images/a.yuv", payload, compress_type=zipfile.ZIP_STORED)
+            zf.writestr("depth_maps/a.raw", payload[::-1], compress_type=zipfile.ZIP_DEFLATED)
+
+        result = {}
+        extractor = AsyncExtractor(mixed_zip, on_finished=lambda path: result.setdefault("dir", path),
+                                   on_error=lambda err: result.setdefault("error", err))
+        extractor.start()
+        extractor.join()
+
+        self.assertNotIn("error", result)
+        with open(os.path.join(result["dir"], "raw_images", "a.yuv"), 'rb') as f:
+            self.assertEqual(f.read(), payload)
+        with open(os.path.join(result["dir"], "depth_maps", "a.raw"), 'rb') as f:
+            self.assertEqual(f.read(), payload[::-1])
+
+    def test_async_extraction(self):
+        progress, result = [], {}
+        extractor = AsyncExtractor(
+            self.valid_zip,
+            on_progress=progress.append,
+            on_finished=lambda path: result.setdefault("dir", path),
+            on_error=lambda err: result.setdefault("error", err)
+        )
+        extractor.start()
+        extractor.join()
+
+        self.assertNotIn("error", result)
+        self.assertTrue(os.path.isfile(os.path.join(result["dir"], "raw_images", "test.jpg")))
+        with open(os.path.join(result["dir"], "depth_maps", "test.png")) as f:
+            self.assertEqual(f.read(), "data")
+        self.assertEqual(progress, sorted(progress))
+        self.assertEqual(progress[-1], 100)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,112 @@
+import sys
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+import numpy as np
+import cv2
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+try:
+    import torch
+    from modules import monocular_depth
+    from modules.monocular_depth import DepthEstimator
+except ImportError:
+    torch = None
+
+def _stub_transform(img):
+    # Like the MiDaS transforms: fixed height, aspect ratio kept, width a multiple of 8
+    h, w = img.shape[:2]
+    size = (max(8, round(32 * w / h / 8) * 8), 32)
+    x = cv2.resize(img, size).astype(np.float32) / 255.0
+    return torch.from_numpy(x.transpose(2, 0, 1).copy()).unsqueeze(0)
+
+def _stub_model():
+    class StubMidas(torch.nn.Module):
+        # Per-sample and independent of batch composition, like MiDaS in eval mode
+        def forward(self, x):
+            return x[:, 0] * 2.0 + x[:, 1] - x[:, 2]
+    return StubMidas()
+
+def _stub_estimator(test):
+    """CPU DepthEstimator whose hub model/transforms are stubbed for the duration of test."""
+    transforms = SimpleNamespace(small_transform=_stub_transform, dpt_transform=_stub_transform)
+    patches = [
+        mock.patch.object(monocular_depth, "_hub_load", side_effect=lambda repo, model: _stub_model()),
+        mock.patch.object(monocular_depth, "_midas_transforms", return_value=transforms),
+        mock.patch.dict(monocular_depth._TORCH_MODEL_CACHE, clear=True),
+    ]
+    for p in patches:
+        p.start()
+        test.addCleanup(p.stop)
+    return DepthEstimator(model_type="MiDaS_small", backend="cpu", fp16=False)
+
+@unittest.skipIf(torch is None, "PyTorch not installed")
+class TestDepthEstimatorBatch(unittest.TestCase):
+    def setUp(self):
+        self.estimator = _stub_estimator(self)
+        rng = np.random.default_rng(0)
+        # 48x64 and 96x128 share a transformed size but not an output size; 64x64 is its own group
+        shapes = [(48, 64), (96, 128), (64, 64), (48, 64), (96, 128), (64, 64), (48, 64)]
+        self.images = [rng.integers(0, 256, (h, w, 3), dtype=np.uint8) for h, w in shapes]
+
+    def test_batch_matches_single_in_order(self):
+        expected = [self.estimator.estimate_depth(img) for img in self.images]
+        for batch_size in (1, 3, 8):
+            results = list(self.estimator.estimate_depth_batch(iter(self.images), batch_size=batch_size))
+            self.assertEqual(len(results), len(self.images))
+            for img, depth, ref in zip(self.images, results, expected):
+                self.assertEqual(depth.shape, img.shape[:2])
+                self.assertEqual(depth.dtype, np.float32)
+                np.testing.assert_allclose(depth, ref, atol=1e-6)
+
+    def test_gray_and_path_inputs(self):
+        gray = self.images[0][..., 0]
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, "frame.png")
+        cv2.imwrite(path, self.images[2][..., ::-1])
+        results = list(self.estimator.estimate_depth_batch([gray, path], batch_size=2))
+        np.testing.assert_allclose(results[0], self.estimator.estimate_depth(gray), atol=1e-6)
+        np.testing.assert_allclose(results[1], self.estimator.estimate_depth(path), atol=1e-6)
+
+@unittest.skipIf(torch is None, "PyTorch not installed")
+class TestDepthMapFormats(unittest.TestCase):
+    def setUp(self):
+        self.estimator = _stub_estimator(self)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        self.depth = np.random.default_rng(0).random((24, 40)).astype(np.float32)
+        self.depth[0, :3] = [0.0, 1.0, 0.5]
+
+    def round_trip(self, name, fmt):
+        path = os.path.join(self.dir, name)
+        self.estimator.save_depth_map(self.depth, path, format=fmt)
+        loaded = DepthEstimator.load_depth_map(path)
+        self.assertEqual(loaded.shape, self.depth.shape)
+        self.assertEqual(loaded.dtype, np.float32)
+        return loaded
+
+    def test_png16_round_trip(self):
+        np.testing.assert_allclose(self.round_trip("d.png", "png16"), self.depth, atol=1 / 65535)
+        # Scratch buffers are reallocated when the frame size changes
+        self.depth = self.depth[:10, :12]
+        np.testing.assert_allclose(self.round_trip("small.png", "png16"), self.depth, atol=1 / 65535)
+
+    def test_npy_round_trip(self):
+        loaded = self.round_trip("d.npy", "npy")
+        np.testing.assert_array_equal(loaded, self.depth.astype(np.float16).astype(np.float32))
+
+    @unittest.skipUnless(torch is not None and monocular_depth.HAS_LZ4, "lz4 not installed")
+    def test_lz4_round_trip(self):
+        loaded = self.round_trip("d.lz4", "lz4")
+        np.testing.assert_array_equal(loaded, self.depth.astype(np.float16).astype(np.float32))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            self.estimator.save_depth_map(self.depth, os.path.join(self.dir, "d.bin"), format="exr")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+import numpy as np
+import cv2
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from modules.quest_image_processor import QuestImageProcessor
+
+class TestQuestImageProcessor(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.test_dir, 'images'))
+        os.makedirs(os.path.join(self.test_dir, 'depth'))
+        cv2.imwrite(os.path.join(self.test_dir, 'images', '0.jpg'), np.full((4, 6, 3), 128, np.uint8))
+        cv2.imwrite(os.path.join(self.test_dir, 'depth', '0.png'), np.full((4, 6), 1000, np.uint16))
+        self.frames = [
+            {'cameras': {'left': {'image': 'images/0.jpg', 'depth': 'depth/0.png'}}},
+            {'cameras': {'left': {'image': 'images/1.jpg', 'depth': 'depth/1.png'}}},
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_build_file_index(self):
+        index = QuestImageProcessor.build_file_index(self.test_dir, self.frames)
+        self.assertIn(Path(self.test_dir) / 'images/0.jpg', index)
+        self.assertIn(Path(self.test_dir) / 'depth/0.png', index)
+        self.assertNotIn(Path(self.test_dir) / 'images/1.jpg', index)
+
+    def test_process_frame_with_file_index(self):
+        index = QuestImageProcessor.build_file_index(self.test_dir, self.frames)
+        rgb, depth, _ = QuestImageProcessor.process_quest_frame(self.test_dir, self.frames[0], file_index=index)
+        self.assertEqual(rgb.shape, (4, 6, 3))
+        np.testing.assert_allclose(depth, 1.0)
+        missing = QuestImageProcessor.process_quest_frame(self.test_dir, self.frames[1], file_index=index)
+        self.assertEqual(missing, (None, None, None))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -39,5 +39,14 @@ class TestReconstruction(unittest.TestCase):
         mesh = self.recon.extract_mesh()
         self.assertIsInstance(mesh, o3d.geometry.TriangleMesh)
 
+    def test_block_count_estimate(self):
+        positions = np.random.default_rng(0).random((50, 3)) * [3.0, 0.5, 3.0]
+        estimate = self.recon.estimate_block_count(positions, depth_range=5.0)
+        self.assertGreaterEqual(estimate, 16384)
+        self.assertLessEqual(estimate, self.recon.block_count)
+        self.recon.set_block_count(estimate)
+        self.assertEqual(self.recon.block_count, estimate)
+        self.assertIs(self.recon.volume, self.recon.vbg)
+
 if __name__ == '__main__':
     unittest.main()